@@ -1,6 +1,8 @@
 import sys
 import os
 
+import pytest
+
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.append(BASE_DIR)
@@ -44,3 +46,26 @@ with open(filename, 'r', errors='ignore') as f:
     assert file != default_md, (
         f'Не забудьте оформить `{filename}.`'
     )
+
+
+@pytest.fixture(scope='session', autouse=True)
+def isolated_caches(tmp_path_factory):
+    # Keeps the tests away from the cache files of a running server.
+    from django.conf import settings
+    from django.test import override_settings
+    directory = tmp_path_factory.mktemp('cache')
+    caches = {
+        alias: {**config, 'LOCATION': directory / f'{alias}.sqlite3'}
+        for alias, config in settings.CACHES.items()
+    }
+    with override_settings(CACHES=caches):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    # The test database is flushed between tests, so objects with the
+    # same IDs must not be served from the previous test's cache.
+    from django.core.cache import caches
+    for cache in caches.all():
+        cache.clear()
@@ -40,3 +40,33 @@ def user_client(token):
     client = APIClient()
     client.credentials(HTTP_AUTHORIZATION=f'Bearer {token["access"]}')
     return client
+
+
+@pytest.fixture
+def asgi_get(token):
+    """
+    Sends an authenticated GET through the project's ASGI application.
+    Returns the status and the whole body.
+    """
+    from asgiref.sync import async_to_sync
+    from yatube_api.asgi import application
+
+    def get(path, query_string=''):
+        messages = []
+
+        async def receive():
+            return {'type': 'http.request', 'body': b''}
+
+        async def send(message):
+            messages.append(message)
+
+        async_to_sync(application)({
+            'type': 'http', 'method': 'GET', 'path': path,
+            'query_string': query_string.encode(), 'headers': [
+                (b'host', b'testserver'),
+                (b'authorization', f'Bearer {token["access"]}'.encode())],
+        }, receive, send)
+        return messages[0]['status'], b''.join(
+            message.get('body', b'') for message in messages[1:])
+
+    return get
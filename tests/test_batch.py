@@ -0,0 +1,74 @@
+import json
+from http import HTTPStatus
+
+import pytest
+
+from posts.models import Comment
+
+
+@pytest.mark.django_db(transaction=True)
+class TestBatch:
+
+    url = '/api/v1/batch/'
+
+    def test_batch_of_reads(self, user_client, post, comment_1_post, group_1,
+                            follow_1):
+        calls = [
+            {'method': 'GET', 'path': f'/api/v1/posts/{post.id}/'},
+            {'method': 'GET', 'path': f'/api/v1/posts/{post.id}/comments/'},
+            {'method': 'GET', 'path': f'/api/v1/groups/{group_1.id}/'},
+            {'method': 'GET', 'path': '/api/v1/follow/'},
+            {'method': 'GET', 'path': '/api/v1/posts/?limit=1'},
+            {'method': 'GET', 'path': '/api/v1/unknown/'},
+        ]
+        response = user_client.post(self.url, data={'requests': calls},
+                                    format='json')
+        assert response.status_code == HTTPStatus.OK, (
+            f'Эндпоинт `{self.url}` не найден, проверьте настройки в '
+            '*urls.py*.'
+        )
+        responses = response.json()['responses']
+        assert [item['status'] for item in responses] == [
+            HTTPStatus.OK] * 5 + [HTTPStatus.NOT_FOUND], (
+            'Проверьте, что ответы возвращаются в порядке запросов.'
+        )
+        assert responses[0]['body']['id'] == post.id
+        assert responses[1]['body'][0]['id'] == comment_1_post.id
+        assert responses[2]['body']['slug'] == group_1.slug
+        assert len(responses[3]['body']) == 1, (
+            'Проверьте, что вызовы пакета выполняются от имени '
+            'пользователя пакетного запроса.'
+        )
+        assert responses[4]['body']['results'][0]['id'] == post.id
+
+    def test_batch_writes_in_order(self, user_client, client, post):
+        comments_url = f'/api/v1/posts/{post.id}/comments/'
+        calls = [
+            {'method': 'POST', 'path': comments_url, 'body': {'text': 'Раз'}},
+            {'method': 'GET', 'path': comments_url},
+        ]
+        responses = user_client.post(
+            self.url, data={'requests': calls}, format='json'
+        ).json()['responses']
+        assert responses[0]['status'] == HTTPStatus.CREATED
+        assert [comment['text'] for comment in responses[1]['body']] == [
+            'Раз'], (
+            'Проверьте, что вызовы с записью выполняются по порядку.'
+        )
+
+        response = client.post(
+            self.url, data=json.dumps({'requests': calls[:1]}),
+            content_type='application/json')
+        assert response.json()['responses'][0]['status'] == (
+            HTTPStatus.UNAUTHORIZED), (
+            'Проверьте, что вызовы анонимного пакета не авторизованы.'
+        )
+        assert Comment.objects.count() == 1
+
+    def test_batch_invalid(self, user_client):
+        for data in ({'requests': []},
+                     {'requests': [{'method': 'GET', 'path': '/admin/'}]},
+                     {'requests': [{'method': 'GET',
+                                    'path': '/api/v1/posts/'}] * 21}):
+            response = user_client.post(self.url, data=data, format='json')
+            assert response.status_code == HTTPStatus.BAD_REQUEST
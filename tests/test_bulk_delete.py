@@ -0,0 +1,39 @@
+from django.core.management import call_command
+import pytest
+
+from posts.models import Comment, Follow, Post
+from posts.services import bulk_delete
+
+
+@pytest.mark.django_db(transaction=True)
+class TestBulkDelete:
+
+    def test_bulk_delete_post_cascades(self, post, another_post,
+                                       comment_1_post, comment_2_post,
+                                       comment_1_another_post):
+        deleted = bulk_delete(Post.objects.filter(id=post.id), batch_size=1)
+
+        assert deleted == 1, (
+            'Проверьте, что `bulk_delete` возвращает число удалённых постов.'
+        )
+        assert not Post.objects.filter(id=post.id).exists()
+        assert not Comment.objects.filter(post_id=post.id).exists(), (
+            'Проверьте, что `bulk_delete` удаляет комментарии к посту.'
+        )
+        assert Comment.objects.filter(id=comment_1_another_post.id).exists(), (
+            'Проверьте, что `bulk_delete` не удаляет чужие комментарии.'
+        )
+
+    def test_bulk_delete_user_command(self, django_user_model, user,
+                                      another_user, post, another_post,
+                                      comment_1_another_post, follow_1,
+                                      follow_4):
+        call_command('bulk_delete', user=[user.username], batch_size=1)
+
+        assert not django_user_model.objects.filter(id=user.id).exists()
+        assert not Post.objects.filter(author_id=user.id).exists()
+        assert not Comment.objects.filter(author_id=user.id).exists()
+        assert not Follow.objects.exists(), (
+            'Проверьте, что удаляются подписки пользователя и на него.'
+        )
+        assert Post.objects.filter(id=another_post.id).exists()
@@ -0,0 +1,90 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import cache, caches
+
+from api.cache import post_namespace
+from posts.models import Post
+
+
+@pytest.mark.django_db(transaction=True)
+class TestPostCache:
+
+    post_detail_url = '/api/v1/posts/{post_id}/'
+    comments_url = '/api/v1/posts/{post_id}/comments/'
+
+    def test_post_detail_cached(self, client, user_client, post,
+                                django_assert_num_queries):
+        url = self.post_detail_url.format(post_id=post.id)
+        client.get(url)
+        with django_assert_num_queries(0):
+            response = client.get(url)
+        assert response.json()['text'] == post.text, (
+            'Проверьте, что повторный запрос поста отдаётся из кеша.'
+        )
+
+        user_client.patch(url, data={'text': 'Новый текст'})
+        assert client.get(url).json()['text'] == 'Новый текст', (
+            'Проверьте, что изменение поста сбрасывает кеш.'
+        )
+
+        user_client.delete(url)
+        assert client.get(url).status_code == HTTPStatus.NOT_FOUND
+
+    def test_comments_cached(self, client, user_client, post,
+                             comment_1_post, django_assert_num_queries):
+        url = self.comments_url.format(post_id=post.id)
+        client.get(url)
+        with django_assert_num_queries(0):
+            assert len(client.get(url).json()) == 1
+
+        user_client.post(url, data={'text': 'Новый комментарий'})
+        assert len(client.get(url).json()) == 2, (
+            'Проверьте, что новый комментарий сбрасывает кеш комментариев.'
+        )
+
+    def test_stale_copy_served_while_recomputed(self, client, post,
+                                                monkeypatch):
+        from api import cache as post_cache
+
+        url = self.post_detail_url.format(post_id=post.id)
+        monkeypatch.setattr(post_cache, 'POST_CACHE_TIMEOUT', -1)
+        client.get(url)
+        Post.objects.filter(id=post.id).update(text='Изменён в обход API')
+        namespace = post_cache.post_namespace(post.id)
+        lock_key = (f'{namespace}:{post_cache._version(namespace)}'
+                    ':post:lock')
+        post_cache.cache.add(lock_key, True)
+
+        assert client.get(url).json()['text'] == post.text, (
+            'Проверьте, что пока другой запрос пересчитывает пост, '
+            'отдаётся устаревшая копия.'
+        )
+
+    def test_missing_post_cached(self, client, user, post,
+                                 django_assert_num_queries):
+        missing_id = post.id + 1
+        url = self.comments_url.format(post_id=missing_id)
+        assert client.get(url).status_code == HTTPStatus.NOT_FOUND
+        with django_assert_num_queries(0):
+            assert client.get(url).status_code == HTTPStatus.NOT_FOUND, (
+                'Проверьте, что 404 для несуществующего поста кешируется.'
+            )
+
+        Post.objects.create(id=missing_id, text='Новый пост', author=user)
+        assert client.get(url).status_code == HTTPStatus.OK, (
+            'Проверьте, что после создания поста кеш 404 сбрасывается.'
+        )
+
+    def test_missing_posts_bounded_apart(self, client, post):
+        cache.set('kept', 'значение')
+        for missing_id in range(post.id + 1, post.id + 21):
+            assert client.get(self.comments_url.format(
+                post_id=missing_id)).status_code == HTTPStatus.NOT_FOUND
+        assert caches['missing_posts'].get(
+            f'{post_namespace(post.id + 1)}:missing') is True, (
+            'Проверьте, что отсутствующие посты хранятся в своём кеше.'
+        )
+        assert cache.get('kept') == 'значение', (
+            'Проверьте, что отсутствующие посты не вытесняют основной кеш.'
+        )
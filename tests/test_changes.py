@@ -0,0 +1,64 @@
+from http import HTTPStatus
+from importlib import import_module
+
+import pytest
+from django.apps import apps
+
+from posts.models import Change, Comment, Post
+
+
+@pytest.mark.django_db(transaction=True)
+class TestChangesAPI:
+
+    url = '/api/v1/posts/changes/'
+
+    def test_changes_full_sync(self, client, post, comment_1_post):
+        response = client.get(self.url)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{self.url}` возвращает статус 200.'
+        )
+        test_data = response.json()
+        assert [item['id'] for item in test_data['posts']] == [post.id]
+        assert [item['id'] for item in test_data['comments']] == [
+            comment_1_post.id
+        ]
+        assert test_data['token'] > 0
+
+    def test_changes_seeded_for_existing_rows(self, client, post,
+                                              comment_1_post):
+        Change.objects.all().delete()
+        seed = import_module('posts.migrations.0021_seed_changes')
+        seed.seed_changes(apps, None)
+        seed.seed_changes(apps, None)
+        assert list(Change.objects.values_list('kind', 'object_id')) == [
+            (Change.POST, post.id), (Change.COMMENT, comment_1_post.id)], (
+            'Проверьте, что миграция однократно заносит в журнал '
+            'существующие посты и комментарии.'
+        )
+        data = client.get(self.url).json()
+        assert [item['id'] for item in data['posts']] == [post.id]
+
+    def test_changes_since_token(self, client, post, another_post,
+                                 comment_1_post):
+        token = client.get(self.url).json()['token']
+        Post.objects.filter(id=another_post.id).first().delete()
+        post.text = 'Новый текст'
+        post.save()
+
+        test_data = client.get(f'{self.url}?since={token}').json()
+        assert [item['text'] for item in test_data['posts']] == [
+            'Новый текст'
+        ], (
+            'Проверьте, что изменения с указанного токена содержат только '
+            'изменённые посты.'
+        )
+        assert test_data['comments'] == []
+        assert test_data['deleted']['posts'] == [another_post.id], (
+            'Проверьте, что удалённые посты возвращаются в `deleted`.'
+        )
+        assert test_data['token'] > token
+        assert not Comment.objects.filter(post_id=another_post.id).exists()
+
+    def test_changes_bad_token(self, client):
+        response = client.get(f'{self.url}?since=abc')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
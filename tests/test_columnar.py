@@ -0,0 +1,55 @@
+from http import HTTPStatus
+
+import pytest
+
+
+def decode_columns(table):
+    """Turns a columnar table back into a list of objects."""
+    rows = []
+    for number in range(table['rows']):
+        row = {}
+        for field in table['fields']:
+            value = table['columns'][field][number]
+            if field in table['dictionaries']:
+                value = table['dictionaries'][field][value]
+            row[field] = value
+        rows.append(row)
+    return rows
+
+
+@pytest.mark.django_db(transaction=True)
+class TestColumnarFormat:
+
+    def test_columnar_lists_match_regular(self, user_client, post, post_2,
+                                          another_post, comment_1_post,
+                                          comment_2_post, follow_1, follow_5):
+        for url in ('/api/v1/posts/', f'/api/v1/posts/{post.id}/comments/',
+                    '/api/v1/follow/'):
+            response = user_client.get(f'{url}?format=columnar')
+            assert response.status_code == HTTPStatus.OK
+            assert response['Content-Type'].startswith(
+                'application/vnd.yatube.columnar+json'
+            )
+            regular = user_client.get(url)
+            assert decode_columns(response.json()) == regular.json(), (
+                f'Проверьте, что колоночный ответ `{url}` содержит те же '
+                'данные, что и обычный.'
+            )
+
+        table = user_client.get('/api/v1/posts/?format=columnar').json()
+        assert table['dictionaries']['author'] == [post.author.username, (
+            another_post.author.username
+        )], (
+            'Проверьте, что повторяющиеся авторы кодируются словарём.'
+        )
+
+    def test_columnar_paginated_and_detail(self, client, post, another_post):
+        response = client.get('/api/v1/posts/?format=columnar&limit=1')
+        test_data = response.json()
+        assert test_data['count'] == 2
+        assert decode_columns(test_data['results'])[0]['id'] == post.id
+
+        response = client.get(f'/api/v1/posts/{post.id}/?format=columnar')
+        assert response.json()['id'] == post.id, (
+            'Проверьте, что одиночные объекты отдаются как обычный JSON.'
+        )
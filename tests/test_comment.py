@@ -369,3 +369,52 @@ class TestCommentAPI:
             'Проверьте, что для неавторизованного пользователя DELETE-запрос '
             f'к `{self.comment_detail_url}` не удаляет комментарий.'
         )
+
+    def test_comment_thread(self, user_client, post, another_post,
+                            comment_1_post, comment_1_another_post,
+                            django_assert_max_num_queries):
+        url = self.comments_url.format(post_id=post.id)
+        reply = user_client.post(
+            url, data={'text': 'Ответ', 'parent': comment_1_post.id}
+        ).json()
+        assert reply['depth'] == 1, (
+            'Проверьте, что ответ на комментарий получает глубину 1.'
+        )
+        nested = user_client.post(
+            url, data={'text': 'Ответ 2', 'parent': reply['id']}
+        ).json()
+        Comment.objects.create(author=post.author, post=post, text='Другой')
+        replies = [
+            Comment.objects.create(
+                author=post.author, post=post, parent_id=nested['id'],
+                text=f'Ответ {number}')
+            for number in range(3, 11)
+        ]
+
+        with django_assert_max_num_queries(4):
+            response = user_client.get(f'{url}?thread={comment_1_post.id}')
+        assert response.status_code == HTTPStatus.OK
+        assert [item['id'] for item in response.json()] == [
+            comment_1_post.id, reply['id'], nested['id'],
+            *(comment.id for comment in replies)
+        ], (
+            'Проверьте, что параметр `thread` возвращает всю ветку '
+            'комментария в порядке обхода.'
+        )
+        response = user_client.get(
+            f'{url}?thread={comment_1_post.id}&depth=1'
+        )
+        assert len(response.json()) == 2
+        response = user_client.get(
+            f'{url}?thread={comment_1_post.id}&depth=-1'
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что отрицательная глубина ветки отклоняется.'
+        )
+
+        response = user_client.post(
+            url, data={'text': 'Ответ', 'parent': comment_1_another_post.id}
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что нельзя ответить на комментарий к другому посту.'
+        )
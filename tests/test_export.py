@@ -0,0 +1,66 @@
+from http import HTTPStatus
+from io import StringIO
+import json
+
+from django.core.management import call_command
+import pytest
+
+
+@pytest.mark.django_db(transaction=True)
+class TestExportAPI:
+
+    url = '/api/v1/export/'
+
+    def test_export_not_auth(self, client, post):
+        response = client.get(self.url)
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            f'Проверьте, что экспорт `{self.url}` недоступен анониму.'
+        )
+
+    def test_export_ndjson(self, user_client, post, another_post,
+                           comment_1_post, comment_1_another_post):
+        response = user_client.get(self.url)
+        assert response.status_code == HTTPStatus.OK
+        assert response['Content-Type'] == 'application/x-ndjson'
+        rows = [
+            json.loads(line)
+            for line in b''.join(response.streaming_content).splitlines()
+        ]
+        assert [(row['type'], row['id']) for row in rows] == [
+            ('post', post.id), ('post', another_post.id),
+            ('comment', comment_1_post.id),
+            ('comment', comment_1_another_post.id),
+        ]
+        assert rows[0]['author'] == post.author.username
+        assert rows[0]['group'] == post.group.slug
+
+    def test_export_under_asgi(self, asgi_get, post, comment_1_post):
+        status, body = asgi_get(self.url)
+        assert status == HTTPStatus.OK, (
+            'Проверьте, что экспорт работает через ASGI-приложение.'
+        )
+        assert [(row['type'], row['id']) for row in map(
+            json.loads, body.splitlines())] == [
+            ('post', post.id), ('comment', comment_1_post.id)]
+
+    def test_export_filters(self, user_client, post, another_post,
+                            comment_1_post, comment_1_another_post):
+        response = user_client.get(f'{self.url}?group={post.group.slug}')
+        rows = [
+            json.loads(line)
+            for line in b''.join(response.streaming_content).splitlines()
+        ]
+        assert [(row['type'], row['id']) for row in rows] == [
+            ('post', post.id), ('comment', comment_1_post.id),
+        ], (
+            'Проверьте, что экспорт учитывает фильтр по группе.'
+        )
+        response = user_client.get(f'{self.url}?since=not-a-date')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_export_command(self, post, another_post):
+        output = StringIO()
+        call_command('export_posts', author=post.author.username,
+                     stdout=output)
+        rows = [json.loads(line) for line in output.getvalue().splitlines()]
+        assert [row['id'] for row in rows] == [post.id]
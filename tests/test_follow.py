@@ -190,3 +190,40 @@ class TestFollowAPI:
             f'GET-запрос с параметром `search` к `{self.url}` содержит только '
             'те подписки, которые удовлетворяют параметрам поиска.'
         )
+
+    def test_follow_put_delete_idempotent(self, user_client, user, user_2,
+                                          django_assert_num_queries):
+        url = f'{self.url}{user_2.username}/'
+        with django_assert_num_queries(2):
+            response = user_client.put(url)
+        assert response.status_code == HTTPStatus.CREATED, (
+            f'Проверьте, что PUT-запрос к `{url}` создаёт подписку '
+            'одним запросом на запись и возвращает статус 201.'
+        )
+        assert response.json() == {
+            'user': user.username, 'following': user_2.username}
+        assert user_client.put(url).status_code == HTTPStatus.OK, (
+            'Проверьте, что повторный PUT-запрос возвращает статус 200.'
+        )
+        assert Follow.objects.filter(user=user, following=user_2).count() == 1
+
+        for _ in range(2):
+            response = user_client.delete(url)
+            assert response.status_code == HTTPStatus.NO_CONTENT, (
+                f'Проверьте, что DELETE-запрос к `{url}` возвращает '
+                'статус 204, даже если подписки уже нет.'
+            )
+        assert not Follow.objects.filter(user=user).exists()
+
+    def test_follow_put_invalid(self, user_client, user):
+        response = user_client.put(f'{self.url}{user.username}/')
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что нельзя подписаться на самого себя.'
+        )
+        response = user_client.put(f'{self.url}nobody/')
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что подписка на несуществующего пользователя '
+            'возвращает статус 404.'
+        )
+        with pytest.raises(IntegrityError):
+            Follow.objects.create(user=user, following=user)
@@ -0,0 +1,64 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.following import follow_graph
+from posts.models import Comment, Follow, Post
+
+
+@pytest.fixture(autouse=True)
+def clear_follow_graph():
+    follow_graph.clear()
+    yield
+    follow_graph.clear()
+
+
+@pytest.mark.django_db(transaction=True)
+class TestFollowingFlag:
+
+    posts_url = '/api/v1/posts/'
+
+    def flags(self, client, url):
+        return {item['author']: item['is_following']
+                for item in client.get(url).json()}
+
+    def test_flags(self, user_client, client, user, another_user, user_2,
+                   follow_1):
+        post = Post.objects.create(author=another_user, text='Пост 1')
+        Post.objects.create(author=user_2, text='Пост 2')
+        Comment.objects.create(author=another_user, post=post, text='Да')
+        comments_url = f'{self.posts_url}{post.id}/comments/'
+        detail_url = f'{self.posts_url}{post.id}/'
+
+        expected = {another_user.username: True, user_2.username: False}
+        assert self.flags(user_client, self.posts_url) == expected, (
+            'Проверьте, что в списке постов `is_following` показывает, '
+            'подписан ли пользователь на автора.'
+        )
+        assert user_client.get(detail_url).json()['is_following'] is True
+        assert self.flags(user_client, comments_url) == {
+            another_user.username: True}
+        assert client.get(detail_url).json()['is_following'] is False, (
+            'Проверьте, что кешированный пост не отдаёт флаг '
+            'другого пользователя.'
+        )
+
+        with CaptureQueriesContext(connection) as queries:
+            user_client.get(self.posts_url)
+        assert not any(Follow._meta.db_table in query['sql']
+                       for query in queries.captured_queries), (
+            'Проверьте, что подписки берутся из графа в памяти, '
+            'а не из базы на каждый запрос.'
+        )
+
+        user_client.delete(f'/api/v1/follow/{another_user.username}/')
+        assert self.flags(user_client, self.posts_url)[
+            another_user.username] is False
+        assert user_client.get(detail_url).json()['is_following'] is False, (
+            'Проверьте, что отписка сразу меняет флаг.'
+        )
+        Follow.objects.create(user=user, following=user_2)
+        assert self.flags(user_client, self.posts_url)[
+            user_2.username] is True, (
+            'Проверьте, что новая подписка сразу меняет флаг.'
+        )
@@ -1,8 +1,10 @@
 from http import HTTPStatus
+from io import StringIO
 
+from django.core.management import call_command
 import pytest
 
-from posts.models import Group
+from posts.models import Group, Post
 
 
 @pytest.mark.django_db(transaction=True)
@@ -113,3 +115,33 @@ class TestGroupAPI:
             'виде словаря.'
         )
         self.check_group_info(test_data, '/api/v1/groups/{group_id}/')
+
+    def test_group_stats(self, client, user, another_user, group_1, group_2,
+                         post, post_2, another_post):
+        Post.objects.create(
+            text='Пост другого автора', author=another_user, group=group_1
+        )
+        another_post.group = group_1
+        another_post.save()
+        post_2.delete()
+
+        url = f'{self.group_detail_url.format(group_id=group_1.id)}stats/'
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        test_data = response.json()
+        assert test_data['post_count'] == 3, (
+            'Проверьте, что статистика группы учитывает создание, '
+            'перенос и удаление постов.'
+        )
+        assert test_data['top_authors'][0] == {
+            'author': another_user.username, 'post_count': 2
+        }
+        response = client.get(
+            f'{self.group_detail_url.format(group_id=group_2.id)}stats/'
+        )
+        assert response.json()['post_count'] == 0
+
+        call_command('reconcile_group_stats', stdout=StringIO())
+        assert client.get(url).json() == test_data, (
+            'Проверьте, что пересчёт статистики совпадает с инкрементальной.'
+        )
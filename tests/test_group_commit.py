@@ -0,0 +1,64 @@
+import threading
+from http import HTTPStatus
+
+import pytest
+from django.db import IntegrityError
+
+from posts.group_commit import GroupCommitWriter
+from posts.models import Comment, Follow
+
+
+@pytest.mark.django_db(transaction=True)
+class TestGroupCommit:
+
+    comments_url = '/api/v1/posts/{post_id}/comments/'
+    follow_url = '/api/v1/follow/'
+
+    def test_batch_keeps_results_and_errors_apart(self, user, user_2, post):
+        Follow.objects.create(user=user, following=user_2)
+        writer = GroupCommitWriter(window=0.2)
+        results = {}
+
+        def submit(number):
+            try:
+                results[number] = writer.submit(
+                    lambda: Comment.objects.create(
+                        author=user, post=post, text=f'Коммент {number}'
+                    ) if number else Follow.objects.create(
+                        user=user, following=user_2))
+            except IntegrityError as error:
+                results[number] = error
+
+        threads = [threading.Thread(target=submit, args=(number,))
+                   for number in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert isinstance(results[0], IntegrityError), (
+            'Проверьте, что ошибка записи возвращается её запросу.'
+        )
+        assert all(isinstance(results[number], Comment)
+                   for number in range(1, 5)), (
+            'Проверьте, что остальные записи пакета возвращают результат.'
+        )
+        assert Comment.objects.filter(post=post).count() == 4, (
+            'Проверьте, что ошибка одной записи не откатывает пакет.'
+        )
+
+    def test_api_contract_unchanged(self, settings, user_client, post,
+                                    user_2):
+        settings.GROUP_COMMIT_WRITES = True
+        response = user_client.post(
+            self.comments_url.format(post_id=post.id),
+            data={'text': 'Коммент'})
+        assert response.status_code == HTTPStatus.CREATED
+        assert response.json()['text'] == 'Коммент'
+        assert Comment.objects.filter(id=response.json()['id']).exists()
+
+        data = {'following': user_2.username}
+        assert user_client.post(
+            self.follow_url, data=data).status_code == HTTPStatus.CREATED
+        assert user_client.post(
+            self.follow_url, data=data).status_code == HTTPStatus.BAD_REQUEST
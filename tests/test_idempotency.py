@@ -0,0 +1,85 @@
+from http import HTTPStatus
+
+import pytest
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from api import mixins
+from posts.models import Comment, Post
+
+
+@pytest.mark.django_db(transaction=True)
+class TestIdempotencyKey:
+
+    posts_url = '/api/v1/posts/'
+    comments_url = '/api/v1/posts/{post_id}/comments/'
+
+    def test_retry_replays_response(self, user_client, post):
+        url = self.comments_url.format(post_id=post.id)
+        data = {'text': 'Коммент'}
+        first = user_client.post(url, data=data, HTTP_IDEMPOTENCY_KEY='abc')
+        retry = user_client.post(url, data=data, HTTP_IDEMPOTENCY_KEY='abc')
+        assert first.status_code == retry.status_code == HTTPStatus.CREATED
+        assert retry.json() == first.json(), (
+            'Проверьте, что повтор запроса с тем же Idempotency-Key '
+            'возвращает сохранённый ответ.'
+        )
+        assert retry['Idempotent-Replayed'] == 'true'
+        assert Comment.objects.filter(post=post).count() == 1, (
+            'Проверьте, что повтор запроса не создаёт дубликат.'
+        )
+
+        user_client.post(url, data=data, HTTP_IDEMPOTENCY_KEY='other')
+        assert Comment.objects.filter(post=post).count() == 2, (
+            'Проверьте, что запрос с новым ключом выполняется.'
+        )
+
+    def test_key_reused_with_other_body(self, user_client):
+        user_client.post(self.posts_url, data={'text': 'Пост'},
+                         HTTP_IDEMPOTENCY_KEY='abc')
+        response = user_client.post(self.posts_url, data={'text': 'Другой'},
+                                    HTTP_IDEMPOTENCY_KEY='abc')
+        assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY, (
+            'Проверьте, что ключ, использованный с другим телом запроса, '
+            'отклоняется со статусом 422.'
+        )
+        assert Post.objects.count() == 1
+
+    def test_keys_are_per_user(self, user_client, another_user):
+        other_client = APIClient()
+        other_client.credentials(HTTP_AUTHORIZATION='Bearer ' + str(
+            RefreshToken.for_user(another_user).access_token))
+        for client in (user_client, other_client):
+            response = client.post(self.posts_url, data={'text': 'Пост'},
+                                   HTTP_IDEMPOTENCY_KEY='abc')
+            assert response.status_code == HTTPStatus.CREATED
+        assert Post.objects.count() == 2, (
+            'Проверьте, что ключи разных пользователей не пересекаются.'
+        )
+
+    def test_replay_when_first_request_finishes_before_lock(
+            self, user_client, post, monkeypatch):
+        url = self.comments_url.format(post_id=post.id)
+        data = {'text': 'Коммент'}
+        user_client.post(url, data=data, HTTP_IDEMPOTENCY_KEY='abc')
+
+        class FirstReadMisses:
+            # The retry reads before the first request stores its response.
+            missed = False
+
+            def __getattr__(self, name):
+                return getattr(mixins.caches['idempotency'], name)
+
+            def get(self, key, default=None):
+                if not self.missed:
+                    self.missed = True
+                    return default
+                return mixins.caches['idempotency'].get(key, default)
+
+        monkeypatch.setattr(mixins, 'idempotency_cache', FirstReadMisses())
+        retry = user_client.post(url, data=data, HTTP_IDEMPOTENCY_KEY='abc')
+        assert retry.status_code == HTTPStatus.CREATED
+        assert retry['Idempotent-Replayed'] == 'true'
+        assert Comment.objects.filter(post=post).count() == 1, (
+            'Проверьте, что ответ перечитывается после взятия блокировки.'
+        )
@@ -0,0 +1,110 @@
+from io import StringIO
+import json
+
+from django.core.management import call_command
+import pytest
+
+from posts.imports import ImportFormatError, read_rows
+from posts.models import Change, Comment, Follow, Post
+
+
+@pytest.mark.django_db(transaction=True)
+class TestImportCommand:
+
+    def write_rows(self, tmp_path, rows):
+        path = tmp_path / 'data.ndjson'
+        path.write_text(
+            ''.join(json.dumps(row) + '\n' for row in rows), encoding='utf-8')
+        return str(path)
+
+    def test_import_ndjson(self, tmp_path, user, another_user, group_1):
+        path = self.write_rows(tmp_path, [
+            {'type': 'post', 'id': 10, 'author': user.username,
+             'text': 'Импорт', 'pub_date': '2020-01-01T00:00:00+00:00',
+             'group': group_1.slug},
+            {'type': 'post', 'author': 'nobody', 'text': 'Пропуск'},
+            {'type': 'comment', 'id': 20, 'post': 10,
+             'author': another_user.username, 'text': 'Коммент',
+             'created': '2020-01-02'},
+            {'type': 'comment', 'post': 10, 'parent': 20,
+             'author': user.username, 'text': 'Ответ'},
+            {'type': 'follow', 'user': user.username,
+             'following': another_user.username},
+            {'type': 'follow', 'user': user.username,
+             'following': user.username},
+        ])
+        call_command('import_yatube', path, batch_size=2, stdout=StringIO())
+
+        post = Post.objects.get(id=10)
+        assert post.group == group_1
+        assert post.pub_date.year == 2020, (
+            'Проверьте, что импорт сохраняет дату публикации из файла.'
+        )
+        assert Post.objects.count() == 1
+        assert Comment.objects.get(id=20).created.day == 2
+        reply = Comment.objects.get(parent_id=20)
+        assert reply.path.startswith(Comment.objects.get(id=20).path), (
+            'Проверьте, что импортированные ответы получают путь в ветке.'
+        )
+        assert reply.depth == 1
+        assert Follow.objects.count() == 1
+        assert Change.objects.filter(kind=Change.POST, object_id=10).exists()
+
+    def test_import_resumes_from_checkpoint(self, tmp_path, user):
+        path = self.write_rows(tmp_path, [
+            {'type': 'post', 'author': user.username, 'text': str(number)}
+            for number in range(5)
+        ])
+        checkpoint = tmp_path / 'checkpoint.json'
+        checkpoint.write_text(json.dumps({'rows': 3}))
+        call_command('import_yatube', path, checkpoint=str(checkpoint),
+                     drop_indexes=True, stdout=StringIO())
+
+        assert sorted(Post.objects.values_list('text', flat=True)) == [
+            '3', '4'
+        ], (
+            'Проверьте, что импорт продолжается с сохранённой позиции.'
+        )
+        assert json.loads(checkpoint.read_text()) == {'rows': 5}
+
+    def test_import_into_non_empty_database(self, tmp_path, user, post,
+                                            comment_1_post):
+        new_id = post.id + 100
+        path = self.write_rows(tmp_path, [
+            {'type': 'post', 'id': post.id, 'author': user.username,
+             'text': 'Занятый ID'},
+            {'type': 'comment', 'post': post.id, 'author': user.username,
+             'text': 'К чужому посту'},
+            {'type': 'post', 'id': new_id, 'author': user.username,
+             'text': 'Новый'},
+            {'type': 'comment', 'id': comment_1_post.id, 'post': new_id,
+             'author': user.username, 'text': 'Занятый ID'},
+            {'type': 'comment', 'post': new_id, 'author': user.username,
+             'text': 'Новый'},
+        ])
+        out = StringIO()
+        call_command('import_yatube', path, stdout=out)
+
+        assert 'Imported 2 rows, skipped 3.' in out.getvalue(), (
+            'Проверьте, что строки с занятыми ID пропускаются и считаются.'
+        )
+        assert Post.objects.get(id=post.id).text == post.text
+        assert Post.objects.get(id=new_id).text == 'Новый'
+        assert list(Comment.objects.filter(post=post)) == [comment_1_post], (
+            'Проверьте, что комментарии к посту с занятым ID '
+            'не попадают к существующему посту.'
+        )
+        assert Comment.objects.get(post_id=new_id).text == 'Новый'
+
+    def test_read_rows_mixed_types(self):
+        lines = [json.dumps(row) + '\n' for row in (
+            {'type': 'follow', 'user': 'a', 'following': 'b'},
+            {'text': 'Без типа'},
+        )]
+        assert [row['type'] for row in read_rows(
+            lines, 'ndjson', 'comment')] == ['follow', 'comment'], (
+            'Проверьте, что строки без типа получают тип из --type, '
+            'а не от предыдущей строки.'
+        )
+        with pytest.raises(ImportFormatError):
+            list(read_rows(lines, 'ndjson'))
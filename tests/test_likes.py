@@ -0,0 +1,102 @@
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import IntegrityError
+
+from posts.likes import like
+from posts.models import Like, LikeCounterShard
+
+
+@pytest.mark.django_db(transaction=True)
+class TestLikes:
+
+    like_url = '/api/v1/posts/{post_id}/like/'
+    list_url = '/api/v1/posts/'
+
+    def like_count(self, client, post):
+        return next(item['like_count'] for item in client.get(
+            self.list_url).json() if item['id'] == post.id)
+
+    def test_like_unlike(self, user_client, client, user, post):
+        url = self.like_url.format(post_id=post.id)
+        assert user_client.post(url).status_code == HTTPStatus.CREATED, (
+            f'Проверьте, что POST-запрос к `{url}` ставит лайк '
+            'и возвращает статус 201.'
+        )
+        assert user_client.post(url).status_code == HTTPStatus.OK, (
+            'Проверьте, что повторный лайк возвращает статус 200.'
+        )
+        assert Like.objects.filter(user=user, post=post).count() == 1
+        assert self.like_count(client, post) == 1, (
+            'Проверьте, что число лайков видно до свёртки счётчика.'
+        )
+
+        for _ in range(2):
+            assert user_client.delete(
+                url).status_code == HTTPStatus.NO_CONTENT
+        assert self.like_count(client, post) == 0
+
+        assert client.post(url).status_code == HTTPStatus.UNAUTHORIZED
+        assert user_client.post(self.like_url.format(
+            post_id=post.id + 100)).status_code == HTTPStatus.NOT_FOUND
+        with pytest.raises(IntegrityError):
+            Like.objects.bulk_create([Like(user=user, post=post)] * 2)
+
+    def test_like_count_same_everywhere(self, user_client, client, user,
+                                        comment_1_post, post):
+        post.text = 'Пост с #тегом'
+        post.save()
+        call_command('refresh_trending', stdout=StringIO())
+        detail_url = f'{self.list_url}{post.id}/'
+        client.get(detail_url)
+        token = user_client.get(f'{self.list_url}changes/').json()['token']
+        user_client.post(self.like_url.format(post_id=post.id))
+
+        counts = {
+            'list': self.like_count(client, post),
+            'detail': client.get(detail_url).json()['like_count'],
+            'trending': client.get(
+                f'{self.list_url}trending/').json()[0]['like_count'],
+            'tag': client.get('/api/v1/tags/тегом/posts/').json()[
+                'results'][0]['like_count'],
+        }
+        assert counts == dict.fromkeys(counts, 1), (
+            'Проверьте, что число лайков до свёртки счётчика одинаково '
+            'во всех эндпоинтах постов.'
+        )
+        post.save()
+        changes = user_client.get(
+            f'{self.list_url}changes/', {'since': token}).json()
+        assert changes['posts'][0]['like_count'] == 1
+
+        user_client.delete(self.like_url.format(post_id=post.id))
+        assert client.get(detail_url).json()['like_count'] == 0, (
+            'Проверьте, что снятый лайк сбрасывает кеш поста.'
+        )
+
+    def test_fold(self, client, post, django_user_model):
+        fans = [django_user_model.objects.create_user(username=f'fan{n}')
+                for n in range(5)]
+        for fan in fans:
+            like(fan.id, post.id)
+        fans[0].delete()
+        post.refresh_from_db()
+        assert (post.like_count, self.like_count(client, post)) == (0, 4), (
+            'Проверьте, что лайки копятся в шардах счётчика и что '
+            'удаление пользователя убирает его лайк из числа лайков.'
+        )
+
+        out = StringIO()
+        call_command('fold_like_counts', stdout=out)
+        post.refresh_from_db()
+        assert post.like_count == 4, (
+            'Проверьте, что свёртка переносит шарды в like_count.'
+        )
+        assert not LikeCounterShard.objects.exists()
+        assert self.like_count(client, post) == 4
+
+        post.delete()
+        assert not Like.objects.exists()
+        assert not LikeCounterShard.objects.exists()
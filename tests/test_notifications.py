@@ -0,0 +1,93 @@
+import threading
+from http import HTTPStatus
+
+import pytest
+from django.db import transaction
+
+from posts.models import Comment, Notification, Post, UnreadCount
+from posts.notifications import extract_mentions, notifier
+
+
+@pytest.fixture(autouse=True)
+def notify_in_request(settings):
+    settings.NOTIFY_MENTIONS_IN_BACKGROUND = False
+
+
+@pytest.mark.django_db(transaction=True)
+class TestNotifications:
+
+    url = '/api/v1/notifications/'
+    unread_url = '/api/v1/notifications/unread/'
+    read_url = '/api/v1/notifications/read/'
+
+    def test_extract_mentions(self):
+        assert extract_mentions(
+            'Привет, @bob и @alice.smith. Пиши на a@b.c, @bob!'
+        ) == ['bob', 'alice.smith'], (
+            'Проверьте, что упоминания извлекаются без повторов и адресов.'
+        )
+
+    def test_mentions_notified(self, user_client, user, another_user, post):
+        text = f'@{user.username} и @{another_user.username}, гляньте'
+        user_client.post(f'/api/v1/posts/{post.id}/comments/',
+                         data={'text': text})
+        notification = Notification.objects.get()
+        assert notification.recipient == another_user, (
+            'Проверьте, что уведомление получает упомянутый пользователь, '
+            'но не сам автор.'
+        )
+        assert notification.comment == Comment.objects.get()
+        assert notification.post == post
+        assert UnreadCount.objects.get(user=another_user).count == 1
+
+    def test_inbox(self, user_client, user, another_user):
+        posts = [Post.objects.create(author=another_user,
+                                     text=f'@{user.username} пост {number}')
+                 for number in range(3)]
+
+        response = user_client.get(self.url, {'limit': 2})
+        assert response.status_code == HTTPStatus.OK, (
+            f'Эндпоинт `{self.url}` не найден, проверьте настройки в '
+            '*urls.py*.'
+        )
+        first_page = response.json()
+        assert [item['post'] for item in first_page['results']] == [
+            posts[2].id, posts[1].id], (
+            'Проверьте, что уведомления отдаются от новых к старым.'
+        )
+        assert first_page['results'][0]['actor'] == another_user.username
+        second_page = user_client.get(first_page['next']).json()
+        assert [item['post'] for item in second_page['results']] == [
+            posts[0].id]
+
+        assert user_client.get(self.unread_url).json() == {'count': 3}, (
+            'Проверьте, что число непрочитанных уведомлений ведётся '
+            'счётчиком.'
+        )
+        posts[0].delete()
+        assert user_client.get(self.unread_url).json() == {'count': 2}, (
+            'Проверьте, что удалённые уведомления не считаются.'
+        )
+        assert user_client.post(self.read_url).json() == {'marked': 2}
+        assert user_client.get(self.unread_url).json() == {'count': 0}
+        assert not Notification.objects.filter(is_read=False).exists()
+
+    def test_notifications_not_auth(self, client):
+        assert client.get(self.url).status_code == HTTPStatus.UNAUTHORIZED
+
+    def test_background_fan_out_uses_one_worker(self, settings, user,
+                                                another_user):
+        settings.NOTIFY_MENTIONS_IN_BACKGROUND = True
+        # Queued on commit, so the worker never writes alongside the test.
+        with transaction.atomic():
+            for number in range(5):
+                Post.objects.create(author=another_user,
+                                    text=f'@{user.username} пост {number}')
+        notifier.join()
+        assert UnreadCount.objects.get(user=user).count == 5, (
+            'Проверьте, что упоминания разосланы в фоне.'
+        )
+        assert [thread.name for thread in threading.enumerate()].count(
+            'mention-notifier') == 1, (
+            'Проверьте, что упоминания рассылает один рабочий поток.'
+        )
@@ -1,9 +1,13 @@
+from datetime import timedelta
 from http import HTTPStatus
+from io import StringIO
 
+from django.core.management import call_command
 from django.db.utils import IntegrityError
+from django.utils import timezone
 import pytest
 
-from posts.models import Post
+from posts.models import Comment, Post
 
 
 @pytest.mark.django_db(transaction=True)
@@ -372,3 +376,108 @@ class TestPostAPI:
             'Проверьте, что DELETE-запрос неавторизованного пользователя '
             f'к `{self.post_detail_url}` не удаляет запрошенный пост.'
         )
+
+    def test_post_list_expand_comments(self, client, post, another_post,
+                                       comment_1_post, comment_2_post,
+                                       comment_1_another_post,
+                                       django_assert_max_num_queries):
+        with django_assert_max_num_queries(3):
+            response = client.get(
+                f'{self.post_list_url}?expand=comments&comments_limit=1'
+            )
+        assert response.status_code == HTTPStatus.OK
+        test_data = {item['id']: item for item in response.json()}
+        assert [
+            comment['id'] for comment in test_data[post.id]['comments']
+        ] == [comment_2_post.id], (
+            'Проверьте, что `expand=comments` возвращает последние '
+            'комментарии каждого поста.'
+        )
+        assert test_data[post.id]['comments'][0]['author'] == (
+            comment_2_post.author.username
+        )
+        assert len(test_data[another_post.id]['comments']) == 1
+
+        response = client.get(f'{self.post_list_url}?expand=comments'
+                              '&comments_limit=abc')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_post_list_by_ids(self, client, post, another_post,
+                              django_assert_max_num_queries):
+        missing_id = another_post.id + 100
+        with django_assert_max_num_queries(1):
+            response = client.get(
+                f'{self.post_list_url}?ids={another_post.id},{missing_id},'
+                f'{post.id}'
+            )
+        assert response.status_code == HTTPStatus.OK
+        test_data = response.json()
+        assert [item['id'] for item in test_data['results']] == [
+            another_post.id, post.id
+        ], (
+            'Проверьте, что `ids` возвращает посты в запрошенном порядке.'
+        )
+        assert test_data['missing'] == [missing_id]
+
+        response = client.post(
+            f'{self.post_list_url}lookup/', data={'ids': [post.id]},
+            content_type='application/json'
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert [item['id'] for item in response.json()['results']] == [
+            post.id
+        ]
+
+        ids = ','.join(str(number) for number in range(1, 102))
+        response = client.get(f'{self.post_list_url}?ids={ids}')
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что размер списка `ids` ограничен.'
+        )
+        response = client.get(f'{self.post_list_url}?ids=1,abc')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_post_trending(self, client, post, another_post, comment_1_post,
+                           comment_2_post, comment_1_another_post):
+        Comment.objects.filter(id=comment_1_another_post.id).update(
+            created=timezone.now() - timedelta(days=30)
+        )
+        call_command('refresh_trending', stdout=StringIO())
+
+        response = client.get(f'{self.post_list_url}trending/')
+        assert response.status_code == HTTPStatus.OK
+        assert [item['id'] for item in response.json()] == [post.id], (
+            'Проверьте, что в тренды попадают только посты с недавними '
+            'комментариями.'
+        )
+
+    def test_posts_paginated_count_cached(self, client, user, post, post_2,
+                                          another_post,
+                                          django_assert_num_queries):
+        url = f'{self.post_list_url}?limit=2'
+        response = client.get(url)
+        assert response.json()['count'] == 3
+        with django_assert_num_queries(1):
+            test_data = client.get(url).json()
+        assert test_data['count'] == 3, (
+            'Проверьте, что количество постов берётся из кеша.'
+        )
+        assert test_data['next'] is not None
+
+        Post.objects.create(text='Новый пост', author=user)
+        assert client.get(url).json()['count'] == 4, (
+            'Проверьте, что создание поста сбрасывает кешированное '
+            'количество.'
+        )
+
+    def test_posts_paginated_without_count(self, client, post, post_2,
+                                           another_post):
+        test_data = client.get(
+            f'{self.post_list_url}?limit=2&offset=1&count=false'
+        ).json()
+        assert test_data['count'] is None
+        assert test_data['next'] is None, (
+            'Проверьте, что без подсчёта последняя страница не содержит '
+            'ссылки на следующую.'
+        )
+        assert test_data['previous'] is not None
+        assert len(test_data['results']) == 2
@@ -0,0 +1,101 @@
+from concurrent.futures import ThreadPoolExecutor
+import time
+
+import pytest
+
+from yatube_api import sqlite_cache
+from yatube_api.sqlite_cache import SQLiteCache
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return tmp_path / 'cache.sqlite3'
+
+
+def make_cache(path, **options):
+    return SQLiteCache(path, {'OPTIONS': options})
+
+
+class TestSQLiteCache:
+
+    def test_shared_between_instances(self, cache_path):
+        first, second = make_cache(cache_path), make_cache(cache_path)
+        first.set('key', {'value': [1, 2]})
+        assert second.get('key') == {'value': [1, 2]}, (
+            'Проверьте, что кеш общий для всех процессов с одним файлом.'
+        )
+        assert second.add('key', 'other') is False
+        assert second.delete('key') is True
+        assert first.get('key', 'missing') == 'missing'
+
+    def test_timeouts(self, cache_path):
+        cache = make_cache(cache_path)
+        cache.set('short', 1, timeout=0.05)
+        cache.set('forever', 1, timeout=None)
+        assert cache.has_key('short')
+        time.sleep(0.1)
+        assert cache.get('short') is None
+        assert cache.add('short', 2) is True, (
+            'Проверьте, что `add` перезаписывает просроченное значение.'
+        )
+        assert cache.get('forever') == 1
+
+    def test_atomic_incr(self, cache_path):
+        cache = make_cache(cache_path)
+        cache.set('counter', 0)
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(
+                lambda _: make_cache(cache_path).incr('counter'), range(200)
+            ))
+        assert cache.get('counter') == 200, (
+            'Проверьте, что `incr` атомарен при параллельных вызовах.'
+        )
+        with pytest.raises(ValueError):
+            cache.incr('missing')
+        cache.set('flag', True)
+        assert cache.get('flag') is True
+
+    def test_versions(self, cache_path):
+        cache = make_cache(cache_path)
+        cache.set('key', 'old')
+        cache.incr_version('key')
+        assert cache.get('key') is None
+        assert cache.get('key', version=2) == 'old'
+
+    def test_lru_eviction(self, cache_path, monkeypatch):
+        monkeypatch.setattr(sqlite_cache, 'LRU_RESOLUTION', 0)
+        cache = make_cache(
+            cache_path, MAX_ENTRIES=4, CULL_FREQUENCY=2, CULL_EVERY=1)
+        for number in range(4):
+            cache.set(number, number)
+            time.sleep(0.01)
+        cache.get(0)
+        cache.set('new', 'new')
+        assert cache.get(0) == 0, (
+            'Проверьте, что недавно прочитанные ключи не вытесняются.'
+        )
+        assert cache.get(1) is None and cache.get(2) is None
+        assert cache.get('new') == 'new'
+
+    def test_cull_checked_every_n_writes(self, cache_path):
+        cache = make_cache(
+            cache_path, MAX_ENTRIES=2, CULL_FREQUENCY=2, CULL_EVERY=5)
+        for number in range(4):
+            cache.set(number, number)
+        assert all(cache.has_key(number) for number in range(4)), (
+            'Проверьте, что число записей проверяется не при каждой записи.'
+        )
+        cache.set(4, 4)
+        assert sum(cache.has_key(number) for number in range(5)) < 5
+
+    def test_no_eviction_keeps_live_entries(self, cache_path):
+        cache = make_cache(
+            cache_path, MAX_ENTRIES=2, CULL_EVERY=1, EVICT=False)
+        cache.set('short', 1, timeout=0.05)
+        time.sleep(0.1)
+        for number in range(4):
+            cache.set(number, number)
+        assert all(cache.has_key(number) for number in range(4)), (
+            'Проверьте, что без EVICT живые записи не вытесняются.'
+        )
+        assert cache.get('short') is None
@@ -0,0 +1,86 @@
+import asyncio
+import json
+
+from asgiref.sync import sync_to_async
+import pytest
+
+from api.broadcast import Subscriber, broker
+from api.sse import STREAM_PATH, stream_posts
+from posts.models import Post
+
+
+def run_stream(token, create_posts):
+    """
+    Runs the stream with a fake ASGI client until the posts created
+    by create_posts arrive, then disconnects. Returns the sent body.
+    """
+    async def scenario():
+        sent = []
+        disconnected = asyncio.Event()
+
+        async def receive():
+            await disconnected.wait()
+            return {'type': 'http.disconnect'}
+
+        async def send(message):
+            sent.append(message)
+
+        scope = {'type': 'http', 'path': STREAM_PATH, 'headers': [],
+                 'query_string': f'token={token}'.encode()}
+        stream = asyncio.ensure_future(stream_posts(scope, receive, send))
+        while len(sent) < 2 and not stream.done():
+            await asyncio.sleep(0.01)
+        await sync_to_async(create_posts)()
+        for _ in range(200):
+            if b'event: post' in b''.join(
+                    message.get('body', b'') for message in sent):
+                break
+            await asyncio.sleep(0.01)
+        disconnected.set()
+        await stream
+        return sent
+
+    return asyncio.run(scenario())
+
+
+@pytest.mark.django_db(transaction=True)
+class TestPostStream:
+
+    def test_stream_not_auth(self):
+        sent = run_stream('invalid', lambda: None)
+        assert sent[0]['status'] == 401, (
+            'Проверьте, что поток постов недоступен без токена.'
+        )
+
+    def test_stream_followed_posts(self, token, user, user_2, another_user,
+                                   follow_1):
+        def create_posts():
+            Post.objects.create(text='Чужой пост', author=user_2)
+            Post.objects.create(text='Пост автора', author=another_user)
+
+        sent = run_stream(token['access'], create_posts)
+        assert sent[0]['status'] == 200
+        body = b''.join(message.get('body', b'') for message in sent).decode()
+        events = [
+            json.loads(line[len('data: '):])
+            for line in body.splitlines() if line.startswith('data: ')
+        ]
+        assert [event['text'] for event in events] == ['Пост автора'], (
+            'Проверьте, что поток содержит только новые посты авторов, '
+            'на которых подписан пользователь.'
+        )
+        assert not broker._subscribers, (
+            'Проверьте, что отключившийся клиент отписывается.'
+        )
+
+
+def test_subscriber_drops_oldest_when_full():
+    async def scenario():
+        subscriber = Subscriber({1}, max_queued=2)
+        for number in range(3):
+            subscriber.offer({'author_id': 1, 'post_id': number})
+        return subscriber
+
+    subscriber = asyncio.run(scenario())
+    assert subscriber.dropped == 1
+    assert subscriber.queue.get_nowait()['post_id'] == 1
@@ -0,0 +1,43 @@
+from http import HTTPStatus
+import json
+
+import pytest
+
+
+def streamed_json(response):
+    return json.loads(b''.join(response.streaming_content))
+
+
+@pytest.mark.django_db(transaction=True)
+class TestStreamingLists:
+
+    def test_streamed_lists_match_regular(self, user_client, post,
+                                          another_post, comment_1_post,
+                                          comment_2_post, follow_1, follow_5):
+        for url in ('/api/v1/posts/', '/api/v1/groups/',
+                    f'/api/v1/posts/{post.id}/comments/', '/api/v1/follow/'):
+            response = user_client.get(f'{url}?format=stream')
+            assert response.status_code == HTTPStatus.OK
+            assert response.streaming, (
+                f'Проверьте, что `{url}?format=stream` отдаёт потоковый ответ.'
+            )
+            assert streamed_json(response) == user_client.get(url).json(), (
+                f'Проверьте, что потоковый ответ `{url}` совпадает с обычным.'
+            )
+
+    def test_streamed_under_asgi(self, asgi_get, user_client, post,
+                                 another_post):
+        status, body = asgi_get('/api/v1/posts/', 'format=stream')
+        assert status == HTTPStatus.OK, (
+            'Проверьте, что `?format=stream` работает через ASGI-приложение.'
+        )
+        assert json.loads(body) == user_client.get('/api/v1/posts/').json()
+
+    def test_streamed_empty_list(self, client):
+        response = client.get('/api/v1/posts/?format=stream')
+        assert streamed_json(response) == []
+
+    def test_paginated_list_not_streamed(self, client, post, another_post):
+        response = client.get('/api/v1/posts/?format=stream&limit=1')
+        assert not response.streaming
+        assert response.json()['count'] == 2
@@ -0,0 +1,85 @@
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+
+from posts import suggestions
+from posts.models import Follow, FollowSuggestion
+from posts.suggestions import compute_suggestions, load_follow_graph
+
+
+@pytest.mark.django_db(transaction=True)
+class TestFollowSuggestions:
+
+    url = '/api/v1/follow/suggestions/'
+
+    @pytest.fixture
+    def authors(self, user, django_user_model):
+        authors = [django_user_model.objects.create_user(username=f'a{n}')
+                   for n in range(4)]
+        a0, a1, a2, a3 = authors
+        for follower, following in ((user, a0), (user, a1), (a0, a2),
+                                    (a1, a2), (a1, a3), (a0, a1),
+                                    (a0, user)):
+            Follow.objects.create(user=follower, following=following)
+        return authors
+
+    def test_compute(self, user, authors):
+        suggestions = dict(compute_suggestions(load_follow_graph(), size=5))
+        a0, a1, a2, a3 = authors
+        assert suggestions[user.id] == [(a2.id, 2), (a3.id, 1)], (
+            'Проверьте, что рекомендации упорядочены по числу общих '
+            'подписок и не содержат уже отслеживаемых авторов и самого '
+            'пользователя.'
+        )
+
+    def test_suggestions_endpoint(self, user_client, client, user, authors):
+        call_command('refresh_follow_suggestions', stdout=StringIO())
+        assert FollowSuggestion.objects.filter(user=user).count() == 2
+
+        response = user_client.get(self.url)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Эндпоинт `{self.url}` не найден, проверьте настройки в '
+            '*urls.py*.'
+        )
+        assert response.json() == [
+            {'suggested': 'a2', 'mutual_count': 2},
+            {'suggested': 'a3', 'mutual_count': 1},
+        ]
+
+        Follow.objects.create(user=user, following=authors[2])
+        assert [item['suggested'] for item in user_client.get(
+            self.url).json()] == ['a3'], (
+            'Проверьте, что авторы, на которых пользователь подписался '
+            'после расчёта, не рекомендуются.'
+        )
+        assert client.get(self.url).status_code == HTTPStatus.UNAUTHORIZED
+
+    def test_refresh_swaps_generations(self, user_client, user, authors,
+                                       monkeypatch):
+        call_command('refresh_follow_suggestions', stdout=StringIO())
+        FollowSuggestion.objects.create(
+            user=user, suggested=authors[3], mutual_count=9, rank=1,
+            generation=FollowSuggestion.objects.get(
+                user=user, rank=1).generation + 1)
+        assert [item['suggested'] for item in user_client.get(
+            self.url).json()] == ['a2', 'a3'], (
+            'Проверьте, что пока пишется новое поколение рекомендаций, '
+            'отдаётся предыдущее.'
+        )
+
+        def compute(graph, **kwargs):
+            assert not connection.in_atomic_block, (
+                'Проверьте, что рекомендации считаются вне транзакции.'
+            )
+            return compute_suggestions(graph, **kwargs)
+
+        monkeypatch.setattr(suggestions, 'compute_suggestions', compute)
+        Follow.objects.create(user=user, following=authors[2])
+        call_command('refresh_follow_suggestions', stdout=StringIO())
+        assert FollowSuggestion.objects.values(
+            'generation').distinct().count() == 1
+        assert [item['suggested'] for item in user_client.get(
+            self.url).json()] == ['a3']
@@ -0,0 +1,79 @@
+from http import HTTPStatus
+
+import pytest
+
+from posts.models import Post, PostTag, Tag
+from posts.services import bulk_delete
+from posts.tags import extract_tags
+
+
+@pytest.mark.django_db(transaction=True)
+class TestTags:
+
+    tags_url = '/api/v1/tags/'
+    tag_posts_url = '/api/v1/tags/{name}/posts/'
+
+    def test_extract_tags(self):
+        assert extract_tags('#Django и #django, #питон; a#b ##c #') == {
+            'django', 'питон'}, (
+            'Проверьте, что хештеги нормализуются к нижнему регистру.'
+        )
+
+    def test_tags_follow_post_changes(self, user_client, user):
+        response = user_client.post(
+            '/api/v1/posts/', data={'text': 'Пост про #python и #django'})
+        post = Post.objects.get(id=response.json()['id'])
+        assert set(post.post_tags.values_list('tag__name', flat=True)) == {
+            'python', 'django'}, (
+            'Проверьте, что хештеги индексируются при создании поста.'
+        )
+
+        user_client.patch(f'/api/v1/posts/{post.id}/',
+                          data={'text': 'Теперь про #python и #sql'})
+        counts = dict(Tag.objects.values_list('name', 'post_count'))
+        assert counts == {'python': 1, 'django': 0, 'sql': 1}, (
+            'Проверьте, что счётчики тегов обновляются при изменении поста.'
+        )
+
+        Post.objects.create(author=user, text='Ещё #python')
+        post.delete()
+        assert Tag.objects.get(name='python').post_count == 1
+        bulk_delete(Post.objects.all())
+        assert not PostTag.objects.exists()
+        assert set(Tag.objects.values_list('post_count', flat=True)) == {0}, (
+            'Проверьте, что удаление постов уменьшает счётчики тегов.'
+        )
+
+    def test_tag_timeline_and_top(self, client, user):
+        posts = [Post.objects.create(author=user, text=f'Пост {number} #Тег')
+                 for number in range(5)]
+        Post.objects.create(author=user, text='Другой #другой')
+
+        url = self.tag_posts_url.format(name='тег')
+        response = client.get(url, {'limit': 3})
+        assert response.status_code == HTTPStatus.OK, (
+            f'Эндпоинт `{url}` не найден, проверьте настройки в *urls.py*.'
+        )
+        first_page = response.json()
+        assert [item['id'] for item in first_page['results']] == [
+            post.id for post in reversed(posts)][:3], (
+            'Проверьте, что посты тега отдаются от новых к старым.'
+        )
+        second_page = client.get(first_page['next']).json()
+        assert [item['id'] for item in second_page['results']] == [
+            posts[1].id, posts[0].id], (
+            'Проверьте, что следующая страница продолжает ленту по курсору.'
+        )
+        assert second_page['next'] is None
+
+        assert client.get(
+            self.tag_posts_url.format(name='нет')
+        ).status_code == HTTPStatus.NOT_FOUND
+
+        response = client.get(self.tags_url)
+        assert response.json() == [
+            {'name': 'тег', 'post_count': 5},
+            {'name': 'другой', 'post_count': 1},
+        ], (
+            'Проверьте, что список тегов упорядочен по числу постов.'
+        )
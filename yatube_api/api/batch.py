@@ -0,0 +1,90 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.db import connection
+from django.http import HttpRequest, QueryDict
+from django.urls import Resolver404
+from django.urls.resolvers import RegexPattern, URLResolver
+
+BATCH_MAX_WORKERS = 4
+# Headers of the batch request that must not leak into its calls.
+SKIPPED_META = ('CONTENT_TYPE', 'CONTENT_LENGTH', 'HTTP_IDEMPOTENCY_KEY')
+
+
+def _resolver():
+    # Imported here: api.urls imports the views using this module.
+    from .urls import router_v1
+    return URLResolver(RegexPattern(r'^/api/v1/'), router_v1.urls)
+
+
+def build_request(request, method, path, body=None):
+    """
+    Builds a request for one call of the batch. It carries the
+    batch request's headers and its already authenticated user,
+    so the call does not authenticate again.
+    """
+    path, _, query = path.partition('?')
+    payload = b'' if body is None else json.dumps(body).encode()
+    sub_request = HttpRequest()
+    sub_request.method = method
+    sub_request.path = sub_request.path_info = path
+    sub_request.META = {
+        key: value for key, value in request.META.items()
+        if key not in SKIPPED_META
+    }
+    sub_request.META.update({
+        'REQUEST_METHOD': method,
+        'PATH_INFO': path,
+        'QUERY_STRING': query,
+        'HTTP_ACCEPT': 'application/json',
+        'CONTENT_TYPE': 'application/json',
+        'CONTENT_LENGTH': str(len(payload)),
+    })
+    sub_request.GET = QueryDict(query)
+    sub_request._body = payload
+    sub_request._stream = BytesIO(payload)
+    sub_request._read_started = False
+    if request.user.is_authenticated:
+        sub_request._force_auth_user = request.user
+        sub_request._force_auth_token = request.auth
+    return sub_request
+
+
+def run_call(request, call, resolver=None):
+    """
+    Runs one call through the API router and returns its status
+    and body.
+    """
+    resolver = resolver or _resolver()
+    try:
+        match = resolver.resolve(call['path'].partition('?')[0])
+    except Resolver404:
+        return {'status': 404, 'body': {'detail': 'Not found.'}}
+    response = match.func(
+        build_request(request, call['method'], call['path'],
+                      call.get('body')),
+        *match.args, **match.kwargs)
+    return {'status': response.status_code,
+            'body': getattr(response, 'data', None)}
+
+
+def _run_in_thread(request, call, resolver):
+    try:
+        return run_call(request, call, resolver)
+    finally:
+        connection.close()
+
+
+def run_batch(request, calls):
+    """
+    Runs the calls in order on the request's own database connection.
+    A batch of reads only runs them concurrently instead, since
+    no call can depend on another one.
+    """
+    resolver = _resolver()
+    if len(calls) > 1 and all(call['method'] == 'GET' for call in calls):
+        with ThreadPoolExecutor(BATCH_MAX_WORKERS) as executor:
+            return list(executor.map(
+                lambda call: _run_in_thread(request, call, resolver), calls))
+    return [run_call(request, call, resolver) for call in calls]
@@ -0,0 +1,109 @@
+import asyncio
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+# Messages a subscriber may have queued before the oldest are dropped.
+SUBSCRIBER_QUEUE_SIZE = 100
+
+
+class Subscriber:
+    """
+    A stream client waiting for new posts of the authors it follows.
+    Lives on the event loop serving the client; messages are offered
+    from any thread through the loop.
+    """
+
+    def __init__(self, following_ids, loop=None,
+                 max_queued=SUBSCRIBER_QUEUE_SIZE):
+        self.following_ids = frozenset(following_ids)
+        self.loop = loop or asyncio.get_running_loop()
+        self.queue = asyncio.Queue()
+        self.max_queued = max_queued
+        self.dropped = 0
+
+    def offer(self, message):
+        """
+        Queues the message, dropping the oldest one if the client
+        does not keep up. Must be called on the subscriber's loop.
+        """
+        if self.queue.qsize() >= self.max_queued:
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(message)
+
+
+class Broker:
+    """
+    In-process pub/sub delivering new posts to the subscribers
+    following their authors.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = defaultdict(set)
+
+    def subscribe(self, subscriber):
+        with self._lock:
+            for author_id in subscriber.following_ids:
+                self._subscribers[author_id].add(subscriber)
+
+    def unsubscribe(self, subscriber):
+        with self._lock:
+            for author_id in subscriber.following_ids:
+                subscribers = self._subscribers.get(author_id)
+                if subscribers is None:
+                    continue
+                subscribers.discard(subscriber)
+                if not subscribers:
+                    del self._subscribers[author_id]
+
+    def deliver(self, message):
+        """
+        Hands the message to the subscribers following its author.
+        Safe to call from any thread.
+        """
+        with self._lock:
+            subscribers = list(self._subscribers.get(message['author_id'], ()))
+        for subscriber in subscribers:
+            subscriber.loop.call_soon_threadsafe(subscriber.offer, message)
+
+
+class LocalBroadcast:
+    """
+    Broadcast backend for a single worker process.
+    A cross-worker backend (e.g. on top of Redis pub/sub) publishes
+    messages to all workers and calls deliver in each of them.
+    """
+
+    def __init__(self, deliver):
+        self.deliver = deliver
+
+    def publish(self, message):
+        self.deliver(message)
+
+
+broker = Broker()
+_broadcast = None
+
+
+def get_broadcast():
+    """
+    Returns the broadcast backend set by POST_BROADCAST_BACKEND.
+    """
+    global _broadcast
+    if _broadcast is None:
+        _broadcast = import_string(settings.POST_BROADCAST_BACKEND)(
+            broker.deliver)
+    return _broadcast
+
+
+def publish_post(author_id, post_id, data):
+    """
+    Publishes a new post serialized to JSON to the stream subscribers
+    of all workers.
+    """
+    get_broadcast().publish(
+        {'author_id': author_id, 'post_id': post_id, 'data': data})
@@ -0,0 +1,107 @@
+import time
+
+from django.core.cache import cache, caches
+from django.utils.connection import ConnectionProxy
+
+POST_CACHE_TIMEOUT = 30
+# How long an expired copy may still be served while it is recomputed.
+STALE_TIMEOUT = 60
+LOCK_TIMEOUT = 10
+# Posts created without post_save (bulk_create) show up after this.
+MISSING_POST_TIMEOUT = 300
+LOCK_POLL_INTERVAL = 0.05
+
+# Bounded on its own (see CACHES), so that the IDs of missing posts
+# never push out cached posts, locks or idempotency records.
+missing_post_cache = ConnectionProxy(caches, 'missing_posts')
+
+
+def _version(namespace):
+    """
+    Returns the current version of the namespace. Bumping it makes every
+    key built from the old version unreachable at once.
+    """
+    key = f'{namespace}:version'
+    version = cache.get(key)
+    if version is None:
+        # A fresh unique version, so that keys cached before the version
+        # key was evicted can never be read again.
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key)
+    return version
+
+
+def namespace_version(namespace):
+    """
+    Returns the current version of the namespace, for per-process
+    caches checking whether their copy is still current.
+    """
+    return _version(namespace)
+
+
+def invalidate(namespace):
+    """
+    Drops everything cached in the namespace.
+    """
+    try:
+        cache.incr(f'{namespace}:version')
+    except ValueError:
+        # No version yet, hence nothing cached.
+        pass
+
+
+def get_or_compute(namespace, name, compute, timeout=None):
+    """
+    Returns the cached value or computes and caches it.
+    Only one caller recomputes a missing or expired value at a time:
+    the others get the expired copy if there is one,
+    or wait for the recomputed value.
+    """
+    if timeout is None:
+        timeout = POST_CACHE_TIMEOUT
+    key = f'{namespace}:{_version(namespace)}:{name}'
+    entry = cache.get(key)
+    if entry is not None and entry[0] > time.time():
+        return entry[1]
+    lock_key = f'{key}:lock'
+    deadline = time.monotonic() + LOCK_TIMEOUT
+    while not cache.add(lock_key, True, LOCK_TIMEOUT):
+        if entry is not None:
+            return entry[1]
+        if time.monotonic() > deadline:
+            return compute()
+        time.sleep(LOCK_POLL_INTERVAL)
+        entry = cache.get(key)
+        if entry is not None:
+            return entry[1]
+    try:
+        value = compute()
+        cache.set(key, (time.time() + timeout, value),
+                  timeout + STALE_TIMEOUT)
+        return value
+    finally:
+        cache.delete(lock_key)
+
+
+def post_namespace(post_id):
+    return f'post:{post_id}'
+
+
+def _missing_post_key(post_id):
+    return f'{post_namespace(post_id)}:missing'
+
+
+def is_missing_post(post_id):
+    """
+    Tells whether the post is known not to exist.
+    """
+    return missing_post_cache.get(_missing_post_key(post_id), False)
+
+
+def remember_missing_post(post_id):
+    missing_post_cache.set(
+        _missing_post_key(post_id), True, MISSING_POST_TIMEOUT)
+
+
+def forget_missing_post(post_id):
+    missing_post_cache.delete(_missing_post_key(post_id))
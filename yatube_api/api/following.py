@@ -0,0 +1,100 @@
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+
+from posts.models import Follow
+from .cache import invalidate, namespace_version
+
+FOLLOW_GRAPH_SIZE = 10000
+# Entries are reloaded after this many seconds even without a version
+# change, which covers follows written without signals (bulk imports).
+FOLLOW_GRAPH_MAX_AGE = 300
+
+
+def following_namespace(user_id):
+    return f'following:{user_id}'
+
+
+class FollowGraph:
+    """
+    Per-process cache of the IDs of the authors each user follows,
+    kept as sorted integer arrays for the least recently used users.
+    An entry is current while the version stamp of the user in the
+    shared cache is unchanged; any process changing the user's
+    follows bumps it.
+    """
+
+    def __init__(self, size=FOLLOW_GRAPH_SIZE, max_age=FOLLOW_GRAPH_MAX_AGE):
+        self.size = size
+        self.max_age = max_age
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def following(self, user_id):
+        """
+        Returns the sorted IDs of the authors the user follows,
+        loading them on first use or after a change.
+        """
+        version = namespace_version(following_namespace(user_id))
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if (entry is not None and entry[0] == version
+                    and time.monotonic() - entry[1] < self.max_age):
+                self._entries.move_to_end(user_id)
+                return entry[2]
+        ids = array('q', Follow.objects.filter(user_id=user_id).order_by(
+            'following_id').values_list('following_id', flat=True))
+        with self._lock:
+            self._entries[user_id] = (version, time.monotonic(), ids)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+        return ids
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+follow_graph = FollowGraph()
+
+
+def forget_following(user_id):
+    """
+    Makes every process reload the authors the user follows.
+    """
+    invalidate(following_namespace(user_id))
+
+
+def is_following(following_ids, author_id):
+    index = bisect_left(following_ids, author_id)
+    return index < len(following_ids) and following_ids[index] == author_id
+
+
+def request_following(request):
+    """
+    Returns the sorted IDs of the authors the requesting user follows,
+    looked up once per request; None outside of a request.
+    """
+    if request is None:
+        return None
+    following_ids = getattr(request, '_following_ids', None)
+    if following_ids is None:
+        user = request.user
+        following_ids = (follow_graph.following(user.id)
+                         if user.is_authenticated else array('q'))
+        request._following_ids = following_ids
+    return following_ids
+
+
+def flag_following(request, data, author_id):
+    """
+    Sets is_following on serialized data of an object by the author,
+    e.g. on a copy shared between users through the cache.
+    """
+    following_ids = request_following(request)
+    if following_ids is not None:
+        data['is_following'] = is_following(following_ids, author_id)
+    return data
@@ -0,0 +1,117 @@
+import hashlib
+import json
+from itertools import islice
+
+from django.core.cache import caches
+from django.http import QueryDict, StreamingHttpResponse
+from django.utils.connection import ConnectionProxy
+from rest_framework import serializers, status
+from rest_framework.response import Response
+
+from .renderers import StreamingJSONRenderer
+
+# How long the response to a request with an Idempotency-Key is kept.
+IDEMPOTENCY_TIMEOUT = 24 * 60 * 60
+IDEMPOTENCY_LOCK_TIMEOUT = 30
+MAX_IDEMPOTENCY_KEY_LENGTH = 255
+
+# Kept apart from the LRU default cache: records only leave on expiry.
+idempotency_cache = ConnectionProxy(caches, 'idempotency')
+
+
+class StreamingListMixin:
+    """
+    Mixin for list views sending unpaginated lists chunk by chunk
+    when the streaming renderer is selected, so that memory use and
+    time to first byte do not depend on the number of items.
+    Under ASGI the chunks are read by StreamingASGIHandler, off the
+    event loop.
+    """
+    stream_chunk_size = 500
+
+    def list(self, request, *args, **kwargs):
+        renderer = request.accepted_renderer
+        if not isinstance(renderer, StreamingJSONRenderer):
+            return super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        return StreamingHttpResponse(
+            renderer.render_stream(self.serialize_chunks(queryset)),
+            content_type=renderer.media_type)
+
+    def serialize_chunks(self, queryset):
+        """
+        Yields the queryset serialized in chunks, reading it from the
+        database with a server-side iterator.
+        """
+        rows = queryset.iterator(chunk_size=self.stream_chunk_size)
+        while True:
+            chunk = list(islice(rows, self.stream_chunk_size))
+            if not chunk:
+                return
+            yield self.get_serializer(chunk, many=True).data
+
+
+class IdempotentCreateMixin:
+    """
+    Mixin for create actions honouring the Idempotency-Key header.
+    The first response for a user and key is stored in the
+    idempotency cache; retries with the same key get it replayed
+    without creating anything again. A retry with a different body is rejected.
+    """
+
+    def create(self, request, *args, **kwargs):
+        key = request.headers.get('Idempotency-Key')
+        if key is None:
+            return super().create(request, *args, **kwargs)
+        if not key or len(key) > MAX_IDEMPOTENCY_KEY_LENGTH:
+            raise serializers.ValidationError(
+                'Idempotency-Key must be 1 to '
+                f'{MAX_IDEMPOTENCY_KEY_LENGTH} characters long.')
+        cache_key = 'idempotency:' + hashlib.sha256(
+            f'{request.user.id}:{request.path}:{key}'.encode()).hexdigest()
+        fingerprint = self.request_fingerprint(request)
+        stored = idempotency_cache.get(cache_key)
+        if stored is not None:
+            return self.replay(stored, fingerprint)
+        if not idempotency_cache.add(
+                f'{cache_key}:lock', True, IDEMPOTENCY_LOCK_TIMEOUT):
+            return Response(
+                {'detail': 'A request with this Idempotency-Key '
+                           'is still in progress.'},
+                status=status.HTTP_409_CONFLICT)
+        try:
+            # The first request may have finished and released the lock
+            # between the read above and taking it.
+            stored = idempotency_cache.get(cache_key)
+            if stored is not None:
+                return self.replay(stored, fingerprint)
+            response = super().create(request, *args, **kwargs)
+            idempotency_cache.set(cache_key, (
+                fingerprint, response.status_code, response.data
+            ), IDEMPOTENCY_TIMEOUT)
+            return response
+        finally:
+            idempotency_cache.delete(f'{cache_key}:lock')
+
+    @staticmethod
+    def request_fingerprint(request):
+        data = request.data
+        if isinstance(data, QueryDict):
+            data = dict(data.lists())
+        return hashlib.sha256(json.dumps(
+            data, sort_keys=True, default=str).encode()).hexdigest()
+
+    @staticmethod
+    def replay(stored, fingerprint):
+        stored_fingerprint, status_code, data = stored
+        if stored_fingerprint != fingerprint:
+            return Response(
+                {'detail': 'Idempotency-Key was already used '
+                           'with a different request body.'},
+                status=status.HTTP_422_UNPROCESSABLE_ENTITY)
+        return Response(
+            data, status=status_code, headers={'Idempotent-Replayed': 'true'})
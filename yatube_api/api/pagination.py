@@ -0,0 +1,79 @@
+import hashlib
+
+from rest_framework import pagination
+from rest_framework.utils.urls import replace_query_param
+
+from .cache import get_or_compute
+
+COUNT_CACHE_TIMEOUT = 60
+
+
+def count_namespace(model):
+    return f'count:{model._meta.label_lower}'
+
+
+class CachedCountLimitOffsetPagination(pagination.LimitOffsetPagination):
+    """
+    Limit/offset pagination that does not run COUNT(*) on every page.
+    The count of each query is cached until the model's rows are created
+    or deleted (see api.signals) or the cache times out; with `count=false`
+    it is not computed at all and returned as null. Whether there is a
+    next page is found out by fetching one row more than the limit.
+    """
+    count_query_param = 'count'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.limit = self.get_limit(request)
+        if self.limit is None:
+            return None
+        self.offset = self.get_offset(request)
+        self.request = request
+        if request.query_params.get(self.count_query_param) == 'false':
+            self.count = None
+        else:
+            self.count = self.get_count(queryset)
+        rows = list(queryset[self.offset:self.offset + self.limit + 1])
+        self.has_next = len(rows) > self.limit
+        if (self.count is not None and self.count > self.limit
+                and self.template is not None):
+            self.display_page_controls = True
+        return rows[:self.limit]
+
+    def get_count(self, queryset):
+        query_key = hashlib.md5(str(queryset.query).encode()).hexdigest()
+        return get_or_compute(
+            count_namespace(queryset.model), query_key,
+            lambda: super(CachedCountLimitOffsetPagination, self).get_count(
+                queryset),
+            timeout=COUNT_CACHE_TIMEOUT
+        )
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        url = replace_query_param(url, self.limit_query_param, self.limit)
+        return replace_query_param(
+            url, self.offset_query_param, self.offset + self.limit)
+
+
+class TagTimelinePagination(pagination.CursorPagination):
+    """
+    Keyset pagination of the PostTag rows of a tag, newest first.
+    Pages are read from the (tag, pub_date) index however deep
+    the client scrolls.
+    """
+    page_size = 20
+    page_size_query_param = 'limit'
+    max_page_size = 100
+    ordering = ('-pub_date', '-id')
+
+
+class NotificationPagination(pagination.CursorPagination):
+    """
+    Keyset pagination of a user's notifications, newest first.
+    """
+    page_size = 20
+    page_size_query_param = 'limit'
+    max_page_size = 100
+    ordering = ('-created', '-id')
@@ -0,0 +1,73 @@
+from rest_framework.renderers import JSONRenderer
+
+
+class StreamingJSONRenderer(JSONRenderer):
+    """
+    JSON renderer for list responses streamed in chunks.
+    Selected with `?format=stream`; views using StreamingListMixin
+    then send the list as it is read from the database.
+    Any other response is rendered as regular JSON.
+    """
+    format = 'stream'
+
+    def render_stream(self, chunks):
+        """
+        Yields a JSON array of the items of the chunks,
+        each chunk being a list of serialized items.
+        """
+        yield b'['
+        separator = b''
+        for chunk in chunks:
+            if not chunk:
+                continue
+            # Drop the brackets of the rendered chunk to splice it in.
+            yield separator + self.render(chunk)[1:-1]
+            separator = b','
+        yield b']'
+
+
+class ColumnarJSONRenderer(JSONRenderer):
+    """
+    Renderer for lists in a compact columnar form.
+    Selected with `?format=columnar` or the media type. Instead of one
+    object per item, it sends one array per field; fields holding
+    repeated references (usernames, group and post IDs) are
+    dictionary-encoded: their array holds indexes into the list of
+    distinct values. Paginated lists keep their envelope with the
+    results converted; any other response is rendered as regular JSON.
+    """
+    media_type = 'application/vnd.yatube.columnar+json'
+    format = 'columnar'
+    dictionary_fields = ('author', 'user', 'following', 'group', 'post')
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if isinstance(data, dict) and isinstance(data.get('results'), list):
+            data = {**data, 'results': self.to_columns(data['results'])}
+        elif isinstance(data, list):
+            data = self.to_columns(data)
+        return super().render(data, accepted_media_type, renderer_context)
+
+    def to_columns(self, rows):
+        """
+        Converts a list of objects into columns.
+        """
+        if not all(isinstance(row, dict) for row in rows):
+            return rows
+        fields = list(dict.fromkeys(field for row in rows for field in row))
+        columns = {}
+        dictionaries = {}
+        for field in fields:
+            values = [row.get(field) for row in rows]
+            if field in self.dictionary_fields:
+                codes = {}
+                columns[field] = [
+                    codes.setdefault(value, len(codes)) for value in values]
+                dictionaries[field] = list(codes)
+            else:
+                columns[field] = values
+        return {
+            'rows': len(rows),
+            'fields': fields,
+            'columns': columns,
+            'dictionaries': dictionaries,
+        }
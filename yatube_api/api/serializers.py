@@ -1,21 +1,90 @@
 from rest_framework import serializers, validators
 from rest_framework.relations import SlugRelatedField
 
-from posts.models import Comment, Follow, Group, Post, User
+from posts.models import (Comment, Follow, FollowSuggestion, Group,
+                          GroupAuthorStats, GroupStats, Notification, Post,
+                          Tag, User)
+from .following import flag_following
 
 
-class PostSerializer(serializers.ModelSerializer):
+class FollowingFlagMixin:
+    """
+    Mixin adding whether the requesting user follows the author
+    as `is_following`, looked up in the per-process follow graph.
+    """
+
+    def to_representation(self, instance):
+        return flag_following(
+            self.context.get('request'),
+            super().to_representation(instance), instance.author_id)
+
+
+class PostSerializer(FollowingFlagMixin, serializers.ModelSerializer):
     """
     Serializer for the Post model.
     Allows creating, updating, and viewing posts.
     Fields:
     - author: The author of the post (read-only).
+    - like_count: Number of likes (read-only).
+    - is_following: Whether the requesting user follows the author.
     """
     author = SlugRelatedField(slug_field='username', read_only=True)
 
     class Meta:
         model = Post
         fields = '__all__'
+        read_only_fields = ('like_count',)
+
+    def to_representation(self, instance):
+        """
+        Adds the likes not yet folded into like_count when the queryset
+        annotated them, and the newest comments of the post when the
+        view prefetched them into the `expanded_comments` context.
+        """
+        data = super().to_representation(instance)
+        data['like_count'] += getattr(instance, 'pending_likes', None) or 0
+        expanded = self.context.get('expanded_comments')
+        if expanded is not None:
+            data['comments'] = EmbeddedCommentSerializer(
+                expanded.get(instance.id, ()), many=True,
+                context=self.context).data
+        return data
+
+
+class PostIdsSerializer(serializers.Serializer):
+    """
+    Serializer for a list of post IDs to fetch at once.
+    """
+    MAX_IDS = 100
+
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=MAX_IDS
+    )
+
+
+class SubRequestSerializer(serializers.Serializer):
+    """
+    Serializer for one API call of a batch.
+    """
+    method = serializers.ChoiceField(
+        choices=('GET', 'POST', 'PUT', 'PATCH', 'DELETE'))
+    path = serializers.RegexField(r'^/api/v1/')
+    body = serializers.JSONField(required=False)
+
+
+class BatchSerializer(serializers.Serializer):
+    """
+    Serializer for a list of API calls to run in one request.
+    """
+    MAX_REQUESTS = 20
+
+    requests = serializers.ListField(
+        child=SubRequestSerializer(),
+        allow_empty=False,
+        max_length=MAX_REQUESTS
+    )
 
 
 class GroupSerializer(serializers.ModelSerializer):
@@ -29,12 +98,52 @@ class GroupSerializer(serializers.ModelSerializer):
         fields = '__all__'
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class GroupStatsSerializer(serializers.ModelSerializer):
+    """
+    Serializer for the GroupStats model.
+    Fields:
+    - top_authors: Authors with the most posts in the group
+    and their post counts.
+    """
+    TOP_AUTHORS = 5
+
+    top_authors = serializers.SerializerMethodField()
+
+    class Meta:
+        model = GroupStats
+        fields = ('group', 'post_count', 'last_post_at', 'top_authors')
+
+    def get_top_authors(self, stats):
+        top = GroupAuthorStats.objects.filter(
+            group_id=stats.group_id, post_count__gt=0
+        ).order_by('-post_count').values_list(
+            'author__username', 'post_count')[:self.TOP_AUTHORS]
+        return [
+            {'author': author, 'post_count': post_count}
+            for author, post_count in top
+        ]
+
+
+class TagSerializer(serializers.ModelSerializer):
+    """
+    Serializer for the Tag model.
+    Allows viewing hashtags and their numbers of posts.
+    """
+
+    class Meta:
+        model = Tag
+        fields = ('name', 'post_count')
+
+
+class CommentSerializer(FollowingFlagMixin, serializers.ModelSerializer):
     """
     Serializer for the Comment model.
     Allows creating, updating, and viewing comments on posts.
     Fields:
     - author: The author of the comment (read-only).
+    - parent: The comment being replied to, on the same post.
+    - depth: Nesting level of the reply (read-only).
+    - is_following: Whether the requesting user follows the author.
     """
 
     author = serializers.SlugRelatedField(
@@ -43,9 +152,27 @@ class CommentSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Comment
-        fields = '__all__'
+        exclude = ('path',)
         read_only_fields = ('post',)
 
+    def validate_parent(self, parent):
+        """
+        Validation for the parent field.
+        Checks that the reply is made on the same post
+        and does not exceed the maximum thread depth.
+        """
+        if self.instance is not None and parent != self.instance.parent:
+            raise serializers.ValidationError(
+                'Cannot move a comment to another thread.')
+        if parent is None:
+            return parent
+        if str(parent.post_id) != self.context['view'].kwargs.get('post_id'):
+            raise serializers.ValidationError(
+                'Can only reply to a comment on the same post.')
+        if parent.depth >= Comment.MAX_DEPTH:
+            raise serializers.ValidationError('Thread is too deep.')
+        return parent
+
 
 class FollowSerializer(serializers.ModelSerializer):
     """
@@ -91,3 +218,40 @@ class FollowSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError(
                 'Cannot subscribe to yourself!')
         return following
+
+
+class FollowSuggestionSerializer(serializers.ModelSerializer):
+    """
+    Serializer for the FollowSuggestion model.
+    Fields:
+    - suggested: The suggested author.
+    - mutual_count: Number of followed authors following them.
+    """
+    suggested = SlugRelatedField(slug_field='username', read_only=True)
+
+    class Meta:
+        model = FollowSuggestion
+        fields = ('suggested', 'mutual_count')
+
+
+class NotificationSerializer(serializers.ModelSerializer):
+    """
+    Serializer for the Notification model.
+    Allows viewing mentions of the current user.
+    Fields:
+    - actor: The user who mentioned the recipient.
+    """
+    actor = SlugRelatedField(slug_field='username', read_only=True)
+
+    class Meta:
+        model = Notification
+        fields = ('id', 'actor', 'post', 'comment', 'created', 'is_read')
+
+
+class EmbeddedCommentSerializer(CommentSerializer):
+    """
+    Serializer for comments embedded into posts.
+    Reads the author's username from the `author_username` annotation
+    instead of loading the author.
+    """
+    author = serializers.CharField(source='author_username', read_only=True)
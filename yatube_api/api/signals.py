@@ -0,0 +1,69 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.renderers import JSONRenderer
+
+from posts.models import Follow, Post
+from posts.signals import post_bulk_delete, pre_bulk_delete
+from .broadcast import publish_post
+from .cache import forget_missing_post, invalidate
+from .following import forget_following
+from .pagination import count_namespace
+from .serializers import PostSerializer
+
+
+@receiver(post_save, sender=Post)
+def forget_created_post(sender, instance, created, **kwargs):
+    """
+    Stops answering 404 for a post ID once a post with it is created.
+    """
+    if created:
+        forget_missing_post(instance.id)
+
+
+@receiver(post_save, sender=Post)
+def stream_created_post(sender, instance, created, raw=False, **kwargs):
+    """
+    Pushes a new post to the stream subscribers once it is committed.
+    """
+    if not created or raw:
+        return
+    # A post cannot be liked before it is committed, so its like_count
+    # needs no pending likes here.
+    data = JSONRenderer().render(PostSerializer(instance).data).decode()
+    transaction.on_commit(
+        lambda: publish_post(instance.author_id, instance.id, data))
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_bulk_delete, sender=Post)
+def invalidate_post_counts(sender, created=True, **kwargs):
+    """
+    Drops cached post counts when posts are added or removed.
+    """
+    if created:
+        invalidate(count_namespace(sender))
+
+
+@receiver(post_save, sender=Follow)
+@receiver(post_delete, sender=Follow)
+def forget_changed_following(sender, instance, **kwargs):
+    """
+    Makes the follow graph reload the follower's authors once
+    the change is committed.
+    """
+    user_id = instance.user_id
+    transaction.on_commit(lambda: forget_following(user_id))
+
+
+@receiver(pre_bulk_delete, sender=Follow)
+def forget_bulk_deleted_following(sender, pks, **kwargs):
+    """
+    Makes the follow graph reload the authors of the followers
+    of a batch of bulk deleted follows once it is committed.
+    """
+    user_ids = set(Follow.objects.filter(pk__in=pks).values_list(
+        'user_id', flat=True))
+    transaction.on_commit(
+        lambda: [forget_following(user_id) for user_id in user_ids])
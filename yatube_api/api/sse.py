@@ -0,0 +1,122 @@
+import asyncio
+import json
+from urllib.parse import parse_qs
+
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+
+from posts.models import Follow
+from .broadcast import Subscriber, broker
+
+STREAM_PATH = '/api/v1/stream/posts/'
+HEARTBEAT_INTERVAL = 15
+
+
+def _raw_token(scope):
+    """
+    Takes the JWT from the Authorization header or, since EventSource
+    cannot set headers, from the `token` query parameter.
+    """
+    for name, value in scope.get('headers', ()):
+        if name == b'authorization':
+            parts = value.split()
+            if len(parts) == 2 and parts[0] == b'Bearer':
+                return parts[1]
+    tokens = parse_qs(scope.get('query_string', b'').decode()).get('token')
+    return tokens[0].encode() if tokens else None
+
+
+@sync_to_async
+def _load_following(raw_token):
+    """
+    Authenticates the token and returns the IDs of the authors
+    the user follows.
+    """
+    try:
+        authentication = JWTAuthentication()
+        user = authentication.get_user(
+            authentication.get_validated_token(raw_token))
+        return list(Follow.objects.filter(user=user).values_list(
+            'following_id', flat=True))
+    finally:
+        close_old_connections()
+
+
+async def _send_body(send, body):
+    await send({'type': 'http.response.body', 'body': body.encode(),
+                'more_body': True})
+
+
+async def _wait_for_disconnect(receive):
+    while (await receive())['type'] != 'http.disconnect':
+        pass
+
+
+async def stream_posts(scope, receive, send):
+    """
+    Serves a server-sent events stream of new posts by the authors
+    the user follows. When the client falls behind, the oldest posts
+    are dropped and an `overflow` event tells it to refetch.
+    """
+    raw_token = _raw_token(scope)
+    try:
+        if raw_token is None:
+            raise AuthenticationFailed()
+        following_ids = await _load_following(raw_token)
+    except (AuthenticationFailed, InvalidToken):
+        await send({'type': 'http.response.start', 'status': 401,
+                    'headers': [(b'content-type', b'application/json')]})
+        await send({'type': 'http.response.body',
+                    'body': b'{"detail": "Authentication failed."}'})
+        return
+    subscriber = Subscriber(following_ids, asyncio.get_running_loop())
+    broker.subscribe(subscriber)
+    disconnect = asyncio.ensure_future(_wait_for_disconnect(receive))
+    try:
+        await send({'type': 'http.response.start', 'status': 200,
+                    'headers': [(b'content-type', b'text/event-stream'),
+                                (b'cache-control', b'no-cache'),
+                                (b'x-accel-buffering', b'no')]})
+        await _send_body(send, ': connected\n\n')
+        while True:
+            message = asyncio.ensure_future(subscriber.queue.get())
+            done, _ = await asyncio.wait(
+                (message, disconnect), timeout=HEARTBEAT_INTERVAL,
+                return_when=asyncio.FIRST_COMPLETED)
+            if disconnect in done:
+                message.cancel()
+                return
+            if message not in done:
+                message.cancel()
+                await _send_body(send, ': heartbeat\n\n')
+                continue
+            if subscriber.dropped:
+                dropped, subscriber.dropped = subscriber.dropped, 0
+                await _send_body(
+                    send, 'event: overflow\n'
+                    f'data: {json.dumps({"dropped": dropped})}\n\n')
+            post = message.result()
+            await _send_body(
+                send, f'id: {post["post_id"]}\nevent: post\n'
+                f'data: {post["data"]}\n\n')
+    finally:
+        broker.unsubscribe(subscriber)
+        disconnect.cancel()
+
+
+class PostStreamRouter:
+    """
+    ASGI application serving the post stream itself
+    and passing every other request to Django.
+    """
+
+    def __init__(self, application):
+        self.application = application
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'http' and scope['path'] == STREAM_PATH:
+            return await stream_posts(scope, receive, send)
+        return await self.application(scope, receive, send)
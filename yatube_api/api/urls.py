@@ -1,7 +1,9 @@
 from django.urls import include, path
 from rest_framework import routers
 
-from .views import CommentViewSet, FollowViewSet, GroupViewSet, PostViewSet
+from .views import (BatchView, CommentViewSet, ExportView, FollowViewSet,
+                    GroupViewSet, NotificationViewSet, PostViewSet,
+                    TagViewSet)
 
 router_v1 = routers.DefaultRouter()
 router_v1.register('posts',
@@ -10,14 +12,22 @@ router_v1.register('posts',
 router_v1.register('groups',
                    GroupViewSet,
                    basename='groups')
+router_v1.register('tags',
+                   TagViewSet,
+                   basename='tags')
 router_v1.register(r'posts/(?P<post_id>\d+)/comments',
                    CommentViewSet,
                    basename='comments')
 router_v1.register('follow',
                    FollowViewSet,
                    basename='follow')
+router_v1.register('notifications',
+                   NotificationViewSet,
+                   basename='notifications')
 
 urlpatterns = [
+    path('v1/batch/', BatchView.as_view(), name='batch'),
+    path('v1/export/', ExportView.as_view(), name='export'),
     path('v1/', include(router_v1.urls)),
     path('v1/', include('djoser.urls.jwt')),
 ]
@@ -1,22 +1,159 @@
+from django.db.models import Subquery
+from django.http import Http404, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
-from rest_framework import filters, mixins, pagination, permissions, viewsets
+from rest_framework import (filters, mixins, permissions, serializers, status,
+                            views, viewsets)
+from rest_framework.decorators import action
+from rest_framework.response import Response
 
-from posts.models import Group, Post
+from posts import group_commit
+from posts.exports import iter_export_rows, iter_ndjson, parse_moment
+from posts.likes import add_pending_likes, like, unlike, with_pending_likes
+from posts.models import (Change, Comment, Follow, Group, GroupStats, Post,
+                          Tag, TrendingPost, UnreadCount)
+from posts.notifications import mark_read
+from .batch import run_batch
+from .cache import (get_or_compute, invalidate, is_missing_post,
+                    post_namespace, remember_missing_post)
+from .following import flag_following, forget_following
+from .mixins import IdempotentCreateMixin, StreamingListMixin
+from .pagination import (CachedCountLimitOffsetPagination,
+                         NotificationPagination, TagTimelinePagination)
 from .permissions import IsAuthorOrReadOnly
-from .serializers import (CommentSerializer, FollowSerializer, GroupSerializer,
-                          PostSerializer)
+from .serializers import (BatchSerializer, CommentSerializer,
+                          FollowSerializer, FollowSuggestionSerializer,
+                          GroupSerializer, GroupStatsSerializer,
+                          NotificationSerializer, PostIdsSerializer,
+                          PostSerializer, TagSerializer)
 
+CHANGES_PAGE_SIZE = 1000
+EXPANDED_COMMENTS_LIMIT = 3
+MAX_EXPANDED_COMMENTS_LIMIT = 20
+TOP_TAGS_SIZE = 50
 
-class PostViewSet(viewsets.ModelViewSet):
+
+class PostViewSet(IdempotentCreateMixin, StreamingListMixin,
+                  viewsets.ModelViewSet):
     """
     Viewset for working with posts.
     Implements CRUD methods for the Post model.
     """
-    queryset = Post.objects.all()
+    queryset = with_pending_likes(Post.objects.select_related('author'))
     serializer_class = PostSerializer
     permission_classes = (
         IsAuthorOrReadOnly, permissions.IsAuthenticatedOrReadOnly)
-    pagination_class = pagination.LimitOffsetPagination
+    pagination_class = CachedCountLimitOffsetPagination
+
+    def get_serializer(self, *args, **kwargs):
+        """
+        With `expand=comments`, fetches the newest comments of all the
+        listed posts in one query. `comments_limit` sets how many.
+        """
+        if (not kwargs.get('many')
+                or self.request.query_params.get('expand') != 'comments'):
+            return super().get_serializer(*args, **kwargs)
+        try:
+            limit = int(self.request.query_params.get(
+                'comments_limit', EXPANDED_COMMENTS_LIMIT))
+        except ValueError:
+            raise serializers.ValidationError(
+                'comments_limit must be an integer.')
+        if not 0 < limit <= MAX_EXPANDED_COMMENTS_LIMIT:
+            raise serializers.ValidationError(
+                'comments_limit must be between 1 and '
+                f'{MAX_EXPANDED_COMMENTS_LIMIT}.')
+        posts = list(args[0])
+        context = self.get_serializer_context()
+        context['expanded_comments'] = Comment.latest_for_posts(
+            [post.id for post in posts], limit)
+        return super().get_serializer(
+            posts, *args[1:], context=context, **kwargs)
+
+    def list(self, request, *args, **kwargs):
+        """
+        Returns the posts. With the `ids` parameter (comma-separated),
+        returns only the requested posts, see lookup.
+        """
+        if 'ids' in request.query_params:
+            ids = request.query_params['ids']
+            return self.fetch_by_ids({'ids': ids.split(',') if ids else []})
+        return super().list(request, *args, **kwargs)
+
+    @action(detail=False, methods=('post',),
+            permission_classes=(permissions.AllowAny,))
+    def lookup(self, request):
+        """
+        Returns the posts whose IDs are listed in the request body.
+        """
+        return self.fetch_by_ids(request.data)
+
+    @action(detail=False)
+    def trending(self, request):
+        """
+        Returns the posts of the precomputed trending ranking,
+        best first.
+        """
+        ids = list(TrendingPost.objects.order_by('rank').values_list(
+            'post_id', flat=True))
+        posts = self.get_queryset().in_bulk(ids)
+        return Response(self.get_serializer(
+            [posts[post_id] for post_id in ids if post_id in posts],
+            many=True).data)
+
+    @action(detail=True, methods=('post', 'delete'),
+            permission_classes=(permissions.IsAuthenticated,))
+    def like(self, request, pk=None):
+        """
+        Likes the post for the current user, or removes the like.
+        Answers 201 when the like is added, 200 when it already
+        exists and 204 after DELETE, whether or not there was one.
+        """
+        if not pk.isdigit():
+            raise Http404('No Post matches the given query.')
+        pk = int(pk)
+        if request.method == 'DELETE':
+            if unlike(request.user.id, pk):
+                invalidate(post_namespace(pk))
+            return Response(status=status.HTTP_204_NO_CONTENT)
+        if like(request.user.id, pk):
+            invalidate(post_namespace(pk))
+            return Response(status=status.HTTP_201_CREATED)
+        # Nothing was inserted: either already liked or no such post.
+        get_object_or_404(Post, id=pk)
+        return Response(status=status.HTTP_200_OK)
+
+    def fetch_by_ids(self, data):
+        """
+        Fetches the posts with one query and returns them in the
+        requested order together with the IDs that were not found.
+        """
+        serializer = PostIdsSerializer(data=data)
+        serializer.is_valid(raise_exception=True)
+        ids = list(dict.fromkeys(serializer.validated_data['ids']))
+        posts = self.get_queryset().in_bulk(ids)
+        return Response({
+            'results': self.get_serializer(
+                [posts[post_id] for post_id in ids if post_id in posts],
+                many=True
+            ).data,
+            'missing': [post_id for post_id in ids if post_id not in posts],
+        })
+
+    def retrieve(self, request, *args, **kwargs):
+        """
+        Returns the post, serialized once per cache period
+        however many clients request it.
+        """
+        if not kwargs['pk'].isdigit():
+            return super().retrieve(request, *args, **kwargs)
+
+        def serialize():
+            post = self.get_object()
+            return post.author_id, dict(self.get_serializer(post).data)
+
+        author_id, data = get_or_compute(
+            post_namespace(int(kwargs['pk'])), 'post', serialize)
+        return Response(flag_following(request, dict(data), author_id))
 
     def perform_create(self, serializer):
         """
@@ -24,8 +161,69 @@ class PostViewSet(viewsets.ModelViewSet):
         """
         serializer.save(author=self.request.user)
 
+    def perform_update(self, serializer):
+        super().perform_update(serializer)
+        invalidate(post_namespace(serializer.instance.id))
+
+    def perform_destroy(self, instance):
+        post_id = instance.id
+        super().perform_destroy(instance)
+        invalidate(post_namespace(post_id))
+
+    @action(detail=False)
+    def changes(self, request):
+        """
+        Returns posts and comments created, edited or deleted
+        since the sync token passed in the `since` parameter.
+        """
+        try:
+            since = int(request.query_params.get('since', 0))
+            limit = min(int(request.query_params.get(
+                'limit', CHANGES_PAGE_SIZE)), CHANGES_PAGE_SIZE)
+        except ValueError:
+            raise serializers.ValidationError(
+                'since and limit must be integers.')
+        if since < 0 or limit < 1:
+            raise serializers.ValidationError(
+                'since must not be negative and limit must be positive.')
+        changes = list(Change.objects.filter(id__gt=since).values_list(
+            'id', 'kind', 'object_id', 'action')[:limit])
+        latest = {}
+        for _, kind, object_id, change in changes:
+            latest[kind, object_id] = change
+        changed = {Change.POST: [], Change.COMMENT: []}
+        deleted = {Change.POST: [], Change.COMMENT: []}
+        for (kind, object_id), change in latest.items():
+            if change == Change.DELETED:
+                deleted[kind].append(object_id)
+            else:
+                changed[kind].append(object_id)
+        posts = self.get_queryset().filter(id__in=changed[Change.POST])
+        comments = Comment.objects.filter(
+            id__in=changed[Change.COMMENT]).select_related('author')
+        # Objects deleted after the last change of this page still exist
+        # in the log, so anything missing now is reported as deleted.
+        for kind, found in ((Change.POST, posts), (Change.COMMENT, comments)):
+            found_ids = {obj.id for obj in found}
+            deleted[kind] += [
+                object_id for object_id in changed[kind]
+                if object_id not in found_ids
+            ]
+        context = self.get_serializer_context()
+        return Response({
+            'token': changes[-1][0] if changes else since,
+            'has_more': len(changes) == limit,
+            'posts': PostSerializer(posts, many=True, context=context).data,
+            'comments': CommentSerializer(
+                comments, many=True, context=context).data,
+            'deleted': {
+                'posts': deleted[Change.POST],
+                'comments': deleted[Change.COMMENT],
+            },
+        })
 
-class GroupViewSet(viewsets.ReadOnlyModelViewSet):
+
+class GroupViewSet(StreamingListMixin, viewsets.ReadOnlyModelViewSet):
     """
     Viewset for viewing groups.
     Allows only reading groups for all users.
@@ -33,8 +231,50 @@ class GroupViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = Group.objects.all()
     serializer_class = GroupSerializer
 
+    @action(detail=True)
+    def stats(self, request, pk=None):
+        """
+        Returns the precomputed statistics of the group.
+        """
+        group = self.get_object()
+        stats = GroupStats.objects.filter(group=group).first()
+        return Response(GroupStatsSerializer(
+            stats or GroupStats(group=group)).data)
+
+
+class TagViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
+    """
+    Viewset for working with hashtags.
+    Lists the most used tags and the posts of a tag.
+    """
+    serializer_class = TagSerializer
+    lookup_field = 'name'
+    lookup_value_regex = r'\w+'
+
+    def get_queryset(self):
+        """
+        Gets the most used tags, from the maintained post counts.
+        """
+        return Tag.objects.filter(post_count__gt=0).order_by(
+            '-post_count', 'name')[:TOP_TAGS_SIZE]
 
-class CommentViewSet(viewsets.ModelViewSet):
+    @action(detail=True)
+    def posts(self, request, name=None):
+        """
+        Returns the posts with the tag, newest first,
+        in pages linked by cursors.
+        """
+        tag = get_object_or_404(Tag, name=name.lower())
+        paginator = TagTimelinePagination()
+        page = paginator.paginate_queryset(
+            tag.post_tags.select_related('post__author'), request, self)
+        posts = add_pending_likes([post_tag.post for post_tag in page])
+        return paginator.get_paginated_response(PostSerializer(
+            posts, many=True, context=self.get_serializer_context()).data)
+
+
+class CommentViewSet(IdempotentCreateMixin, StreamingListMixin,
+                     viewsets.ModelViewSet):
     """
     Viewset for working with comments on posts.
     Implements CRUD methods for the Comment model.
@@ -46,24 +286,88 @@ class CommentViewSet(viewsets.ModelViewSet):
     def get_post(self):
         """
         Gets the post object by its ID from the URL.
+        IDs of posts that do not exist are cached, so repeated
+        requests for them do not reach the database.
         """
-        return get_object_or_404(Post, id=self.kwargs.get('post_id'))
+        post_id = int(self.kwargs.get('post_id'))
+        if is_missing_post(post_id):
+            raise Http404('No Post matches the given query.')
+        try:
+            return get_object_or_404(Post, id=post_id)
+        except Http404:
+            remember_missing_post(post_id)
+            raise
 
     def get_queryset(self):
         """
         Gets all comments for a specific post.
+        With the `thread` parameter, gets the subtree of that comment
+        in thread order, limited to `depth` levels if given.
+        """
+        comments = self.get_post().comments.select_related('author')
+        if self.action != 'list' or 'thread' not in self.request.query_params:
+            return comments
+        params = self.request.query_params
+        try:
+            thread = int(params['thread'])
+            max_depth = int(params['depth']) if 'depth' in params else None
+            if max_depth is not None and max_depth < 0:
+                raise ValueError
+        except ValueError:
+            raise serializers.ValidationError(
+                'thread must be an integer and depth '
+                'a non-negative integer.')
+        return get_object_or_404(comments, id=thread).subtree(
+            max_depth, comments)
+
+    def list(self, request, *args, **kwargs):
+        """
+        Returns the comments of the post. The plain list without query
+        parameters is cached per post like the post itself.
         """
-        return self.get_post().comments.all()
+        if request.query_params:
+            return super().list(request, *args, **kwargs)
+
+        def serialize():
+            comments = list(self.filter_queryset(self.get_queryset()))
+            data = self.get_serializer(comments, many=True).data
+            return [(comment.author_id, dict(item))
+                    for comment, item in zip(comments, data)]
+
+        return Response([
+            flag_following(request, dict(item), author_id)
+            for author_id, item in get_or_compute(
+                post_namespace(int(kwargs['post_id'])), 'comment_list',
+                serialize)
+        ])
 
     def perform_create(self, serializer):
         """
         Creates a new comment on the post
         with the current user as the author.
         """
-        serializer.save(author=self.request.user, post=self.get_post())
+        group_commit.save(
+            serializer, author=self.request.user, post=self.get_post())
+        self.invalidate_post_cache()
+
+    def perform_update(self, serializer):
+        super().perform_update(serializer)
+        self.invalidate_post_cache()
 
+    def perform_destroy(self, instance):
+        super().perform_destroy(instance)
+        self.invalidate_post_cache()
 
-class FollowViewSet(mixins.ListModelMixin,
+    def invalidate_post_cache(self):
+        """
+        Drops the cached post and comment list after a comment change.
+        """
+        invalidate(post_namespace(int(self.kwargs['post_id'])))
+
+
+class FollowViewSet(IdempotentCreateMixin,
+                    StreamingListMixin,
+                    mixins.ListModelMixin,
                     mixins.CreateModelMixin,
                     viewsets.GenericViewSet):
     """
@@ -71,20 +375,139 @@ class FollowViewSet(mixins.ListModelMixin,
     Allows viewing user subscriptions.
     When creating a new subscription, automatically
     sets the current user as the follower.
+    PUT and DELETE on /follow/{username}/ subscribe and unsubscribe
+    idempotently with a single write each.
     """
     serializer_class = FollowSerializer
     permission_classes = (permissions.IsAuthenticated,)
     filter_backends = (filters.SearchFilter,)
     search_fields = ('following__username',)
+    lookup_field = 'username'
+    lookup_value_regex = r'[\w.@+-]+'
 
     def get_queryset(self):
         """
         Gets the list of subscriptions for the current user.
         """
-        return self.request.user.follower.all()
+        return self.request.user.follower.select_related('user', 'following')
 
     def perform_create(self, serializer):
         """
         Creates a new subscription on behalf of the current user.
         """
-        serializer.save(user=self.request.user)
+        group_commit.save(serializer, user=self.request.user)
+
+    @action(detail=False)
+    def suggestions(self, request):
+        """
+        Returns the authors suggested to the current user, precomputed
+        by refresh_follow_suggestions, leaving out those followed since.
+        """
+        # While a refresh writes the next generation, the previous
+        # one is still the current one.
+        current = request.user.follow_suggestions.order_by(
+            'generation').values('generation')[:1]
+        suggestions = request.user.follow_suggestions.filter(
+            generation=Subquery(current)).exclude(
+            suggested__in=request.user.follower.values('following')
+        ).select_related('suggested').order_by('rank')
+        return Response(
+            FollowSuggestionSerializer(suggestions, many=True).data)
+
+    def update(self, request, username=None):
+        """
+        Subscribes the current user to the author. Answers 201 when
+        the subscription is created and 200 when it already exists.
+        """
+        if username == request.user.username:
+            raise serializers.ValidationError(
+                {'following': 'You cannot follow yourself.'})
+        data = {'user': request.user.username, 'following': username}
+        if Follow.follow(request.user.id, username):
+            forget_following(request.user.id)
+            return Response(data, status=status.HTTP_201_CREATED)
+        # Nothing was inserted: either already subscribed or no such user.
+        get_object_or_404(
+            Follow, user=request.user, following__username=username)
+        return Response(data)
+
+    def destroy(self, request, username=None):
+        """
+        Unsubscribes the current user from the author.
+        Answers 204 whether or not the subscription existed.
+        """
+        if Follow.unfollow(request.user.id, username):
+            forget_following(request.user.id)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class NotificationViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
+    """
+    Viewset for working with mention notifications.
+    Lists the notifications of the current user, newest first,
+    and reports and resets the number of unread ones.
+    """
+    serializer_class = NotificationSerializer
+    permission_classes = (permissions.IsAuthenticated,)
+    pagination_class = NotificationPagination
+
+    def get_queryset(self):
+        """
+        Gets the notifications of the current user.
+        """
+        return self.request.user.notifications.select_related('actor')
+
+    @action(detail=False)
+    def unread(self, request):
+        """
+        Returns the maintained number of unread notifications.
+        """
+        count = UnreadCount.objects.filter(user=request.user).values_list(
+            'count', flat=True).first()
+        return Response({'count': count or 0})
+
+    @action(detail=False, methods=('post',))
+    def read(self, request):
+        """
+        Marks all notifications of the current user as read.
+        """
+        return Response({'marked': mark_read(request.user)})
+
+
+class ExportView(views.APIView):
+    """
+    View for exporting posts and comments.
+    Streams them as newline-delimited JSON without building
+    the whole response in memory.
+    Supports the since, until, author and group query parameters.
+    """
+    permission_classes = (permissions.IsAuthenticated,)
+
+    def get(self, request):
+        params = request.query_params
+        try:
+            since, until = (
+                parse_moment(params[name]) if params.get(name) else None
+                for name in ('since', 'until')
+            )
+        except ValueError as error:
+            raise serializers.ValidationError(str(error))
+        rows = iter_export_rows(
+            since, until, params.get('author'), params.get('group'))
+        return StreamingHttpResponse(
+            iter_ndjson(rows), content_type='application/x-ndjson')
+
+
+class BatchView(views.APIView):
+    """
+    View for running several API calls in one HTTP round trip.
+    Every call goes through the API router with the batch request's
+    authentication; the responses come back in the order of the calls.
+    """
+    permission_classes = (permissions.AllowAny,)
+
+    def post(self, request):
+        serializer = BatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return Response({'responses': run_batch(
+            request, serializer.validated_data['requests'])})
@@ -0,0 +1,36 @@
+from django.contrib import admin, messages
+from django.contrib.auth.admin import UserAdmin
+
+from .models import Post, User
+from .services import bulk_delete_in_background
+
+
+@admin.action(description='Delete selected in background (bulk)')
+def delete_in_background(modeladmin, request, queryset):
+    """
+    Starts chunked deletion of the selected objects and their
+    dependents without loading the cascade into memory.
+    """
+    pks = list(queryset.values_list('pk', flat=True))
+    bulk_delete_in_background(queryset.model, pks)
+    modeladmin.message_user(
+        request,
+        f'Deletion of {len(pks)} objects has started in the background.',
+        messages.INFO
+    )
+
+
+@admin.register(Post)
+class PostAdmin(admin.ModelAdmin):
+    list_display = ('pk', 'text', 'pub_date', 'author', 'group')
+    list_filter = ('pub_date',)
+    search_fields = ('text',)
+    actions = (delete_in_background,)
+
+
+admin.site.unregister(User)
+
+
+@admin.register(User)
+class BulkDeleteUserAdmin(UserAdmin):
+    actions = (delete_in_background,)
@@ -0,0 +1,88 @@
+import json
+from datetime import datetime, time
+
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from .models import Comment, Post
+
+EXPORT_CHUNK_SIZE = 2000
+
+POST_FIELDS = {
+    'id': 'id',
+    'author__username': 'author',
+    'text': 'text',
+    'pub_date': 'pub_date',
+    'image': 'image',
+    'group__slug': 'group',
+}
+COMMENT_FIELDS = {
+    'id': 'id',
+    'post_id': 'post',
+    'parent_id': 'parent',
+    'author__username': 'author',
+    'text': 'text',
+    'created': 'created',
+}
+
+
+def parse_moment(value):
+    """
+    Parses an ISO date or datetime into an aware datetime.
+    A bare date means the start of that day.
+    Raises ValueError for anything else.
+    """
+    moment = parse_datetime(value)
+    if moment is None:
+        day = parse_date(value)
+        if day is None:
+            raise ValueError(f'Invalid date: {value}')
+        moment = datetime.combine(day, time.min)
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+def _rows(queryset, fields, kind, chunk_size):
+    for values in queryset.values_list(*fields).iterator(
+            chunk_size=chunk_size):
+        row = {'type': kind}
+        for name, value in zip(fields.values(), values):
+            row[name] = value.isoformat() if isinstance(
+                value, datetime) else value
+        yield row
+
+
+def iter_export_rows(since=None, until=None, author=None, group=None,
+                     chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Yields posts and then comments as plain dicts, reading them from the
+    database in chunks so memory use does not depend on the table size.
+    since/until limit pub_date of posts and created of comments,
+    author (username) and group (slug) limit the posts exported
+    and the comments made on them.
+    """
+    posts = Post.objects.order_by('id')
+    comments = Comment.objects.order_by('id')
+    if author is not None:
+        posts = posts.filter(author__username=author)
+    if group is not None:
+        posts = posts.filter(group__slug=group)
+    if author is not None or group is not None:
+        comments = comments.filter(post__in=posts.values('id'))
+    if since is not None:
+        posts = posts.filter(pub_date__gte=since)
+        comments = comments.filter(created__gte=since)
+    if until is not None:
+        posts = posts.filter(pub_date__lt=until)
+        comments = comments.filter(created__lt=until)
+    yield from _rows(posts, POST_FIELDS, 'post', chunk_size)
+    yield from _rows(comments, COMMENT_FIELDS, 'comment', chunk_size)
+
+
+def iter_ndjson(rows):
+    """
+    Encodes rows as newline-delimited JSON, one line per row.
+    """
+    for row in rows:
+        yield json.dumps(row, ensure_ascii=False) + '\n'
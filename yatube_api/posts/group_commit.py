@@ -0,0 +1,100 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+
+# How long the writer waits for more writes to join a batch (seconds).
+GROUP_COMMIT_WINDOW = 0.005
+GROUP_COMMIT_MAX_BATCH = 100
+
+
+class GroupCommitWriter:
+    """
+    Runs writes submitted by concurrent requests in a single writer
+    thread, committing every batch of them in one transaction.
+    Each write runs in its own savepoint, so a failing write only
+    rolls back itself; its caller gets the error, the others their
+    results once the batch is committed.
+    """
+
+    def __init__(self, window=GROUP_COMMIT_WINDOW,
+                 max_batch=GROUP_COMMIT_MAX_BATCH):
+        self.window = window
+        self.max_batch = max_batch
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def submit(self, write):
+        """
+        Runs write() in the writer thread and returns its result
+        after the batch is committed, or raises its error.
+        """
+        future = Future()
+        self._queue.put((write, future))
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name='group-commit', daemon=True)
+                self._thread.start()
+        return future.result()
+
+    def _collect(self):
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.window
+        while len(batch) < self.max_batch:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=timeout))
+            except queue.Empty:
+                break
+        return batch
+
+    def _commit(self, batch):
+        outcomes = []
+        try:
+            with transaction.atomic():
+                for write, future in batch:
+                    try:
+                        with transaction.atomic():
+                            outcomes.append((future, write(), None))
+                    except Exception as error:
+                        outcomes.append((future, None, error))
+        except Exception as error:
+            # The commit itself failed: none of the writes happened.
+            for _, future in batch:
+                future.set_exception(error)
+            return
+        for future, result, error in outcomes:
+            if error is None:
+                future.set_result(result)
+            else:
+                future.set_exception(error)
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            try:
+                self._commit(batch)
+            finally:
+                close_old_connections()
+
+
+writer = GroupCommitWriter()
+
+
+def save(serializer, **kwargs):
+    """
+    Saves the serializer through the group commit writer when
+    GROUP_COMMIT_WRITES is on, or right away otherwise.
+    The caller must not be inside a transaction of its own:
+    the writer thread would not see its uncommitted rows.
+    """
+    if not settings.GROUP_COMMIT_WRITES:
+        return serializer.save(**kwargs)
+    return writer.submit(lambda: serializer.save(**kwargs))
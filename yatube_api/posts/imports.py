@@ -0,0 +1,294 @@
+import csv
+import json
+from collections import Counter
+from contextlib import contextmanager
+from itertools import islice
+
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from .exports import parse_moment
+from .models import Change, Comment, Follow, Group, Post, User
+from .stats import update_group_stats
+from .tags import sync_tags
+
+IMPORT_BATCH_SIZE = 1000
+# Keeps IN (...) lists below the SQLite host parameter limit.
+LOOKUP_BATCH_SIZE = 500
+USERNAME_CACHE_SIZE = 100000
+
+
+class ImportFormatError(ValueError):
+    """Raised for input that cannot be imported at all."""
+
+
+def _optional_id(row, key='id'):
+    return int(row[key]) if row.get(key) else None
+
+
+def _moment(row, key):
+    return parse_moment(row[key]) if row.get(key) else timezone.now()
+
+
+def read_rows(stream, file_format, row_type=None):
+    """
+    Yields rows of an NDJSON or CSV stream as dicts with a `type` key.
+    CSV rows take their type from a `type` column or from row_type.
+    """
+    if file_format == 'ndjson':
+        rows = (json.loads(line) for line in stream if line.strip())
+    elif file_format == 'csv':
+        rows = csv.DictReader(stream)
+    else:
+        raise ImportFormatError(f'Unknown format: {file_format}')
+    for row in rows:
+        kind = row.get('type') or row_type
+        if kind is None:
+            raise ImportFormatError('Rows without type need --type.')
+        row['type'] = kind
+        yield row
+
+
+@contextmanager
+def preserved_timestamps():
+    """
+    Lets bulk_create keep pub_date and created from the input
+    instead of overwriting them with the current time.
+    """
+    fields = [Post._meta.get_field('pub_date'),
+              Comment._meta.get_field('created')]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+@contextmanager
+def dropped_indexes(models):
+    """
+    Drops the plain (non-unique) indexes of the models' tables
+    and recreates them on exit.
+    """
+    quote = connection.ops.quote_name
+    dropped = []
+    with connection.cursor() as cursor:
+        for model in models:
+            table = model._meta.db_table
+            constraints = connection.introspection.get_constraints(
+                cursor, table)
+            for name, info in constraints.items():
+                if (info['index'] and not info['unique']
+                        and not info['primary_key']):
+                    dropped.append((name, table, info['columns']))
+    with connection.schema_editor() as editor:
+        for name, table, _ in dropped:
+            editor.execute(editor.sql_delete_index % {
+                'table': quote(table), 'name': quote(name)})
+    try:
+        yield
+    finally:
+        with connection.schema_editor() as editor:
+            for name, table, columns in dropped:
+                editor.execute(
+                    f'CREATE INDEX {quote(name)} ON {quote(table)} '
+                    f'({", ".join(quote(column) for column in columns)})'
+                )
+
+
+class Importer:
+    """
+    Loads posts, comments and follows in chunked transactions.
+    Usernames and group slugs are resolved in batches, rows with
+    unknown references are skipped and counted. So are posts and
+    comments whose IDs are taken, by existing rows or by another row
+    of the chunk, and the comments referencing them.
+    """
+
+    def __init__(self, batch_size=IMPORT_BATCH_SIZE):
+        self.batch_size = batch_size
+        self.user_ids = {}
+        self.group_ids = dict(Group.objects.values_list('slug', 'id'))
+        self.taken_ids = {Post: set(), Comment: set()}
+        self.imported = 0
+        self.skipped = 0
+
+    def resolve_users(self, usernames):
+        usernames = set(usernames)
+        if len(self.user_ids) + len(usernames) > USERNAME_CACHE_SIZE:
+            self.user_ids.clear()
+        missing = [name for name in usernames if name not in self.user_ids]
+        for start in range(0, len(missing), LOOKUP_BATCH_SIZE):
+            self.user_ids.update(User.objects.filter(
+                username__in=missing[start:start + LOOKUP_BATCH_SIZE]
+            ).values_list('username', 'id'))
+
+    @staticmethod
+    def existing_ids(model, ids):
+        ids = list(set(ids))
+        found = set()
+        for start in range(0, len(ids), LOOKUP_BATCH_SIZE):
+            found.update(model.objects.filter(
+                id__in=ids[start:start + LOOKUP_BATCH_SIZE]
+            ).values_list('id', flat=True))
+        return found
+
+    def claim_ids(self, model, rows):
+        """
+        Records the explicit IDs of the rows that exist already
+        or repeat within the chunk as taken.
+        """
+        ids = Counter(self.build_all(_optional_id, rows))
+        taken = self.taken_ids[model]
+        taken.update(row_id for row_id, count in ids.items() if count > 1)
+        taken.update(self.existing_ids(model, ids))
+
+    def build_post(self, row):
+        author_id = self.user_ids.get(row.get('author'))
+        group_id = self.group_ids.get(row['group']) if row.get(
+            'group') else None
+        if author_id is None or not row.get('text') or (
+                row.get('group') and group_id is None) or (
+                _optional_id(row) in self.taken_ids[Post]):
+            return None
+        return Post(
+            id=_optional_id(row), author_id=author_id, text=row['text'],
+            image=row.get('image') or None, group_id=group_id,
+            pub_date=_moment(row, 'pub_date'),
+        )
+
+    def build_comment(self, row, post_ids, comment_ids):
+        author_id = self.user_ids.get(row.get('author'))
+        post_id = _optional_id(row, 'post')
+        parent_id = _optional_id(row, 'parent')
+        if (author_id is None or post_id not in post_ids
+                or not row.get('text')
+                or (parent_id is not None and parent_id not in comment_ids)
+                or _optional_id(row) in self.taken_ids[Comment]):
+            return None
+        comment = Comment(
+            id=_optional_id(row), author_id=author_id, post_id=post_id,
+            parent_id=parent_id, text=row['text'],
+            created=_moment(row, 'created'),
+        )
+        # Later rows of the chunk may reply to this comment.
+        comment_ids.add(comment.id)
+        return comment
+
+    def build_follow(self, row):
+        user_id = self.user_ids.get(row.get('user'))
+        following_id = self.user_ids.get(row.get('following'))
+        if user_id is None or following_id is None or (
+                user_id == following_id):
+            return None
+        return Follow(user_id=user_id, following_id=following_id)
+
+    @staticmethod
+    def create_logged(model, kind, objects):
+        """
+        Inserts the objects and records them in the change log,
+        which bulk_create would otherwise bypass.
+        """
+        max_before = model.objects.aggregate(max_id=Max('id'))['max_id'] or 0
+        model.objects.bulk_create(objects)
+        created = {obj.id for obj in objects if obj.id is not None}
+        created.update(model.objects.filter(
+            id__gt=max_before).values_list('id', flat=True))
+        Change.objects.bulk_create(
+            Change(kind=kind, object_id=object_id, action=Change.CREATED)
+            for object_id in sorted(created)
+        )
+        return created
+
+    @staticmethod
+    def count_posts(posts):
+        """
+        Adds bulk created posts to group statistics.
+        """
+        latest = {}
+        for post in posts:
+            if post.group_id is not None and (
+                    latest.get(post.group_id) is None
+                    or post.pub_date > latest[post.group_id]):
+                latest[post.group_id] = post.pub_date
+        update_group_stats(
+            Counter((post.group_id, post.author_id) for post in posts),
+            latest)
+
+    @staticmethod
+    def index_tags(post_ids):
+        """
+        Indexes the hashtags of bulk created posts.
+        """
+        post_ids = sorted(post_ids)
+        for start in range(0, len(post_ids), LOOKUP_BATCH_SIZE):
+            sync_tags(list(Post.objects.filter(
+                id__in=post_ids[start:start + LOOKUP_BATCH_SIZE],
+                text__contains='#')))
+
+    @staticmethod
+    def build_all(build, rows, *args):
+        objects = []
+        for row in rows:
+            try:
+                obj = build(row, *args)
+            except (TypeError, ValueError):
+                obj = None
+            if obj is not None:
+                objects.append(obj)
+        return objects
+
+    def import_chunk(self, rows):
+        self.resolve_users(
+            row[key] for row in rows
+            for key in ('author', 'user', 'following') if row.get(key))
+        rows_by_type = {'post': [], 'comment': [], 'follow': []}
+        for row in rows:
+            rows_by_type.get(row['type'], []).append(row)
+        self.claim_ids(Post, rows_by_type['post'])
+        self.claim_ids(Comment, rows_by_type['comment'])
+        posts = self.build_all(self.build_post, rows_by_type['post'])
+        # Existing rows with taken IDs are not the ones the input means.
+        post_ids = self.existing_ids(Post, self.build_all(
+            _optional_id, rows_by_type['comment'], 'post'))
+        post_ids -= self.taken_ids[Post]
+        post_ids.update(post.id for post in posts if post.id)
+        comment_ids = self.existing_ids(Comment, self.build_all(
+            _optional_id, rows_by_type['comment'], 'parent'))
+        comment_ids -= self.taken_ids[Comment]
+        comments = self.build_all(
+            self.build_comment, rows_by_type['comment'], post_ids,
+            comment_ids)
+        follows = self.build_all(self.build_follow, rows_by_type['follow'])
+        with transaction.atomic():
+            if posts:
+                self.index_tags(self.create_logged(Post, Change.POST, posts))
+                self.count_posts(posts)
+            if comments:
+                Comment.fill_missing_paths(self.create_logged(
+                    Comment, Change.COMMENT, comments))
+            Follow.objects.bulk_create(follows, ignore_conflicts=True)
+        imported = len(posts) + len(comments) + len(follows)
+        self.imported += imported
+        self.skipped += len(rows) - imported
+
+    def run(self, rows, skip=0, on_chunk=None):
+        """
+        Imports rows after skipping the first `skip` of them.
+        on_chunk(position) is called after every committed chunk with
+        the number of input rows consumed so far.
+        """
+        rows = islice(rows, skip, None)
+        position = skip
+        with preserved_timestamps():
+            while True:
+                chunk = list(islice(rows, self.batch_size))
+                if not chunk:
+                    return
+                self.import_chunk(chunk)
+                position += len(chunk)
+                if on_chunk is not None:
+                    on_chunk(position)
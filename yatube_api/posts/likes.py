@@ -0,0 +1,139 @@
+import random
+from collections import Counter, defaultdict
+
+from django.db import connection, transaction
+from django.db.models import F, OuterRef, Subquery, Sum
+from django.utils import timezone
+
+from .models import Like, LikeCounterShard, Post
+
+LIKE_COUNTER_SHARDS = 16
+FOLD_BATCH_SIZE = 500
+
+
+def _table(model):
+    return connection.ops.quote_name(model._meta.db_table)
+
+
+def count_like(post_id, delta):
+    """
+    Adds delta to a random counter shard of the post in one upsert.
+    Nothing is counted for a post that no longer exists.
+    """
+    shards = _table(LikeCounterShard)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'INSERT INTO {shards} (post_id, shard, delta) '
+            f'SELECT id, %s, %s FROM {_table(Post)} WHERE id = %s '
+            'ON CONFLICT (post_id, shard) '
+            f'DO UPDATE SET delta = {shards}.delta + excluded.delta',
+            (random.randrange(LIKE_COUNTER_SHARDS), delta, post_id)
+        )
+
+
+def like(user_id, post_id):
+    """
+    Likes the post unless the user already does.
+    Returns whether a like was added.
+    """
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            f'INSERT INTO {_table(Like)} (user_id, post_id, created) '
+            f'SELECT %s, id, %s FROM {_table(Post)} WHERE id = %s '
+            'ON CONFLICT (user_id, post_id) DO NOTHING',
+            (user_id,
+             connection.ops.adapt_datetimefield_value(timezone.now()),
+             post_id)
+        )
+        if cursor.rowcount != 1:
+            return False
+        count_like(post_id, 1)
+    return True
+
+
+def unlike(user_id, post_id):
+    """
+    Removes the user's like of the post.
+    Returns whether there was one.
+    """
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {_table(Like)} WHERE user_id = %s AND post_id = %s',
+            (user_id, post_id)
+        )
+        if cursor.rowcount != 1:
+            return False
+        count_like(post_id, -1)
+    return True
+
+
+def count_deleted_likes(post_ids):
+    """
+    Counts likes removed along with their users, once committed:
+    likes removed along with their post need no counting.
+    """
+    deltas = Counter(post_ids)
+    transaction.on_commit(lambda: [
+        count_like(post_id, -count) for post_id, count in deltas.items()])
+
+
+def with_pending_likes(queryset):
+    """
+    Annotates the posts with the sum of their unfolded like shards,
+    read with one indexed subquery per post.
+    """
+    pending = LikeCounterShard.objects.filter(
+        post=OuterRef('pk')).order_by().values('post').annotate(
+            total=Sum('delta')).values('total')
+    return queryset.annotate(pending_likes=Subquery(pending))
+
+
+def add_pending_likes(posts):
+    """
+    Sets pending_likes on already fetched posts, as with_pending_likes
+    annotates it, reading the shards of all of them in one query.
+    """
+    pending = dict(LikeCounterShard.objects.filter(
+        post_id__in=[post.id for post in posts]).order_by().values(
+            'post').annotate(total=Sum('delta')).values_list('post', 'total'))
+    for post in posts:
+        post.pending_likes = pending.get(post.id)
+    return posts
+
+
+def fold_like_counts(batch_size=FOLD_BATCH_SIZE):
+    """
+    Moves the counter shards into Post.like_count, a batch of shards
+    per transaction. Shards are decreased by the folded amounts rather
+    than overwritten, so likes counted meanwhile are kept.
+    Returns the number of shards folded.
+    """
+    shards_table = _table(LikeCounterShard)
+    folded = 0
+    last_id = 0
+    while True:
+        with transaction.atomic():
+            shards = list(LikeCounterShard.objects.filter(
+                id__gt=last_id).exclude(delta=0).order_by('id').values_list(
+                    'id', 'post_id', 'delta')[:batch_size])
+            if not shards:
+                break
+            totals = Counter()
+            for _, post_id, delta in shards:
+                totals[post_id] += delta
+            by_delta = defaultdict(list)
+            for post_id, delta in totals.items():
+                by_delta[delta].append(post_id)
+            for delta, post_ids in by_delta.items():
+                Post.objects.filter(id__in=post_ids).update(
+                    like_count=F('like_count') + delta)
+            with connection.cursor() as cursor:
+                cursor.executemany(
+                    f'UPDATE {shards_table} SET delta = delta - %s '
+                    'WHERE id = %s',
+                    [(delta, shard_id) for shard_id, _, delta in shards]
+                )
+        folded += len(shards)
+        last_id = shards[-1][0]
+    LikeCounterShard.objects.filter(delta=0).delete()
+    return folded
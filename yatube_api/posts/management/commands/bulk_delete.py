@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from posts.models import Post, User
+from posts.services import BULK_DELETE_BATCH_SIZE, bulk_delete
+
+
+class Command(BaseCommand):
+    help = (
+        'Deletes users or posts together with everything that depends on '
+        'them in bounded batches, reporting progress.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', action='append', default=[],
+                            help='Username of a user to delete.')
+        parser.add_argument('--post', action='append', type=int, default=[],
+                            help='ID of a post to delete.')
+        parser.add_argument('--batch-size', type=int,
+                            default=BULK_DELETE_BATCH_SIZE)
+
+    def progress(self, model, deleted):
+        self.stdout.write(f'{model._meta.label}: {deleted} deleted')
+
+    def handle(self, *args, **options):
+        if not options['user'] and not options['post']:
+            raise CommandError('Pass at least one --user or --post.')
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be positive.')
+        querysets = (
+            User.objects.filter(username__in=options['user']),
+            Post.objects.filter(id__in=options['post']),
+        )
+        for queryset in querysets:
+            bulk_delete(queryset, options['batch_size'], self.progress)
+        self.stdout.write(self.style.SUCCESS('Done.'))
@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from posts.exports import (EXPORT_CHUNK_SIZE, iter_export_rows, iter_ndjson,
+                           parse_moment)
+
+
+class Command(BaseCommand):
+    help = 'Streams posts and comments as newline-delimited JSON.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--since', help='ISO date or datetime.')
+        parser.add_argument('--until', help='ISO date or datetime.')
+        parser.add_argument('--author', help='Username of the author.')
+        parser.add_argument('--group', help='Slug of the group.')
+        parser.add_argument('--output', help='File path, stdout by default.')
+        parser.add_argument('--chunk-size', type=int,
+                            default=EXPORT_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        try:
+            since, until = (
+                parse_moment(options[name]) if options[name] else None
+                for name in ('since', 'until')
+            )
+        except ValueError as error:
+            raise CommandError(error)
+        rows = iter_export_rows(since, until, options['author'],
+                                options['group'], options['chunk_size'])
+        if not options['output']:
+            for line in iter_ndjson(rows):
+                self.stdout.write(line)
+            return
+        with open(options['output'], 'w', encoding='utf-8') as output:
+            output.writelines(iter_ndjson(rows))
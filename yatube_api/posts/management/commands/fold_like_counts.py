@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from posts.likes import FOLD_BATCH_SIZE, fold_like_counts
+
+
+class Command(BaseCommand):
+    help = (
+        'Folds the like counter shards into the like counts of posts. '
+        'Meant to be run periodically, e.g. from cron.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=FOLD_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        if options['batch_size'] <= 0:
+            raise CommandError('--batch-size must be positive.')
+        folded = fold_like_counts(options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Folded {folded} shards.'))
@@ -0,0 +1,82 @@
+import json
+import os
+import sys
+import time
+from contextlib import nullcontext
+
+from django.core.management.base import BaseCommand, CommandError
+
+from posts.imports import (IMPORT_BATCH_SIZE, Importer, dropped_indexes,
+                           read_rows)
+from posts.models import Comment, Follow, Post
+
+
+class Command(BaseCommand):
+    help = (
+        'Imports posts, comments and follows from an NDJSON or CSV stream '
+        'in chunked transactions.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Input file, "-" for stdin.')
+        parser.add_argument('--format', choices=('ndjson', 'csv'),
+                            help='Guessed from the file extension if omitted.')
+        parser.add_argument('--type', choices=('post', 'comment', 'follow'),
+                            help='Row type for CSV files without a type '
+                                 'column.')
+        parser.add_argument('--batch-size', type=int,
+                            default=IMPORT_BATCH_SIZE)
+        parser.add_argument('--checkpoint',
+                            help='File storing the number of rows already '
+                                 'imported, used to resume a load.')
+        parser.add_argument('--drop-indexes', action='store_true',
+                            help='Drop plain indexes during the load and '
+                                 'rebuild them afterwards.')
+
+    def read_checkpoint(self, path):
+        if not path or not os.path.exists(path):
+            return 0
+        with open(path, encoding='utf-8') as checkpoint:
+            return json.load(checkpoint)['rows']
+
+    def write_checkpoint(self, path, rows):
+        with open(f'{path}.tmp', 'w', encoding='utf-8') as checkpoint:
+            json.dump({'rows': rows}, checkpoint)
+        os.replace(f'{path}.tmp', path)
+
+    def handle(self, *args, **options):
+        path = options['path']
+        file_format = options['format'] or (
+            'csv' if path.endswith('.csv') else 'ndjson')
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be positive.')
+        skip = self.read_checkpoint(options['checkpoint'])
+        importer = Importer(options['batch_size'])
+        started = time.monotonic()
+
+        def on_chunk(position):
+            if options['checkpoint']:
+                self.write_checkpoint(options['checkpoint'], position)
+            rate = importer.imported / max(time.monotonic() - started, 1e-6)
+            self.stdout.write(
+                f'{position} rows read, {importer.imported} imported, '
+                f'{importer.skipped} skipped, {rate:.0f} rows/s'
+            )
+
+        stream = sys.stdin if path == '-' else open(
+            path, encoding='utf-8', newline='')
+        indexes = dropped_indexes((Post, Comment, Follow)) if options[
+            'drop_indexes'] else nullcontext()
+        try:
+            with indexes:
+                importer.run(read_rows(stream, file_format, options['type']),
+                             skip, on_chunk)
+        except ValueError as error:
+            # Malformed input such as invalid JSON or rows without type.
+            raise CommandError(error)
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {importer.imported} rows, skipped {importer.skipped}.'
+        ))
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from posts.models import Group
+from posts.stats import reconcile_group_stats
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds group statistics from the posts table.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--group', action='append', default=[],
+                            help='Slug of a group to rebuild, all by default.')
+
+    def handle(self, *args, **options):
+        groups = Group.objects.all()
+        if options['group']:
+            groups = groups.filter(slug__in=options['group'])
+        reconcile_group_stats(groups)
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt statistics of {groups.count()} groups.'))
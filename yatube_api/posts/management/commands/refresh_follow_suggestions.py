@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from posts.suggestions import (SUGGESTIONS_MAX_FANOUT, SUGGESTIONS_SIZE,
+                               refresh_suggestions)
+
+
+class Command(BaseCommand):
+    help = (
+        'Recomputes the authors suggested to every user to follow '
+        'from the follow graph. Meant to be run periodically, e.g. '
+        'from cron.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--size', type=int, default=SUGGESTIONS_SIZE)
+        parser.add_argument(
+            '--max-fanout', type=int, default=SUGGESTIONS_MAX_FANOUT)
+
+    def handle(self, *args, **options):
+        if min(options['size'], options['max_fanout']) <= 0:
+            raise CommandError('All options must be positive.')
+        users = refresh_suggestions(
+            size=options['size'], max_fanout=options['max_fanout'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Computed suggestions for {users} users.'))
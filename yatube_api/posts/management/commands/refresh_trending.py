@@ -0,0 +1,33 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+
+from posts.trending import (TRENDING_HALF_LIFE, TRENDING_SIZE,
+                            TRENDING_WINDOW, refresh_trending)
+
+
+class Command(BaseCommand):
+    help = (
+        'Recomputes the trending posts ranking from recent comments. '
+        'Meant to be run periodically, e.g. from cron.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--window-hours', type=float,
+            default=TRENDING_WINDOW.total_seconds() / 3600)
+        parser.add_argument(
+            '--half-life-hours', type=float,
+            default=TRENDING_HALF_LIFE.total_seconds() / 3600)
+        parser.add_argument('--size', type=int, default=TRENDING_SIZE)
+
+    def handle(self, *args, **options):
+        if min(options['window_hours'], options['half_life_hours'],
+               options['size']) <= 0:
+            raise CommandError('All options must be positive.')
+        ranked = refresh_trending(
+            window=timedelta(hours=options['window_hours']),
+            half_life=timedelta(hours=options['half_life_hours']),
+            size=options['size'],
+        )
+        self.stdout.write(self.style.SUCCESS(f'Ranked {ranked} posts.'))
@@ -0,0 +1,46 @@
+# Generated by Django 3.2.16 on 2026-10-19 15:56
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def fill_paths(apps, schema_editor):
+    """Makes every existing comment the root of its own thread."""
+    Comment = apps.get_model('posts', 'Comment')
+    digits = '0123456789abcdefghijklmnopqrstuvwxyz'
+    for pk in Comment.objects.values_list('pk', flat=True).iterator():
+        path, rest = '', pk
+        while rest:
+            rest, digit = divmod(rest, 36)
+            path = digits[digit] + path
+        Comment.objects.filter(pk=pk).update(path=path.rjust(8, '0'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0011_change'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='depth',
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='parent',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='replies', to='posts.comment'),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='path',
+            field=models.CharField(default='', editable=False, max_length=255),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['post', 'path'], name='comment_thread_idx'),
+        ),
+        migrations.RunPython(fill_paths, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 3.2.16 on 2026-10-19 16:00
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('posts', '0013_comment_post_created_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GroupAuthorStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('post_count', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='GroupStats',
+            fields=[
+                ('group', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='posts.group')),
+                ('post_count', models.IntegerField(default=0)),
+                ('last_post_at', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['group', 'pub_date'], name='post_group_pub_date_idx'),
+        ),
+        migrations.AddField(
+            model_name='groupauthorstats',
+            name='author',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='group_stats', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='groupauthorstats',
+            name='group',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='author_stats', to='posts.group'),
+        ),
+        migrations.AddIndex(
+            model_name='groupauthorstats',
+            index=models.Index(fields=['group', '-post_count'], name='group_top_authors_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='groupauthorstats',
+            unique_together={('group', 'author')},
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 3.2.16 on 2026-10-19 16:02
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0014_group_stats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TrendingPost',
+            fields=[
+                ('post', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='trending', serialize=False, to='posts.post')),
+                ('score', models.FloatField()),
+                ('rank', models.PositiveIntegerField(db_index=True)),
+            ],
+            options={
+                'ordering': ('rank',),
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.2.16 on 2026-10-19 16:10
+
+from django.db import migrations, models
+import django.db.models.expressions
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0015_trending_post'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='follow',
+            constraint=models.CheckConstraint(check=models.Q(('user', django.db.models.expressions.F('following')), _negated=True), name='follow_not_self'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+from itertools import islice
+
+from django.db import migrations
+
+SEED_BATCH_SIZE = 1000
+
+
+def seed_changes(apps, schema_editor):
+    """
+    Logs posts and comments created before the change log existed,
+    posts first and each kind in ID order, so that a full sync
+    from token 0 returns them.
+    """
+    Change = apps.get_model('posts', 'Change')
+    for kind, model_name in (('post', 'Post'), ('comment', 'Comment')):
+        model = apps.get_model('posts', model_name)
+        logged = Change.objects.filter(kind=kind).values('object_id')
+        pks = iter(list(model.objects.exclude(pk__in=logged).order_by(
+            'pk').values_list('pk', flat=True)))
+        while True:
+            batch = list(islice(pks, SEED_BATCH_SIZE))
+            if not batch:
+                break
+            Change.objects.bulk_create(
+                Change(kind=kind, object_id=pk, action='created')
+                for pk in batch
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0020_follow_suggestions'),
+    ]
+
+    operations = [
+        migrations.RunPython(seed_changes, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 3.2.16 on 2026-10-19 16:50
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('posts', '0021_seed_changes'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='followsuggestion',
+            options={'ordering': ('user', 'generation', 'rank')},
+        ),
+        migrations.AddField(
+            model_name='followsuggestion',
+            name='generation',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AlterUniqueTogether(
+            name='followsuggestion',
+            unique_together={('user', 'generation', 'rank')},
+        ),
+    ]
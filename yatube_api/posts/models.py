@@ -1,5 +1,7 @@
 from django.contrib.auth import get_user_model
-from django.db import models
+from django.db import connection, models
+from django.db.models import F, Q, Window
+from django.db.models.functions import RowNumber
 
 User = get_user_model()
 
@@ -29,6 +31,8 @@ class Post(models.Model):
     - author: Post author (foreign key to the user model).
     - image: Post image.
     - group: Group to which the post belongs (foreign key to the group model).
+    - like_count: Number of likes, as of the last fold of the like
+      counter shards (see posts.likes).
     """
     text = models.TextField()
     pub_date = models.DateTimeField('Publication date', auto_now_add=True)
@@ -40,23 +44,51 @@ class Post(models.Model):
         Group, on_delete=models.SET_NULL,
         related_name='posts', blank=True, null=True
     )
+    like_count = models.IntegerField(default=0)
 
     class Meta:
         ordering = ('pub_date',)
+        indexes = (
+            models.Index(fields=('group', 'pub_date'),
+                         name='post_group_pub_date_idx'),
+        )
 
     def __str__(self):
         return self.text[:50]
 
 
+def path_segment(pk):
+    """
+    Encodes a comment ID as a fixed-width base 36 path segment,
+    so that paths sort in thread order.
+    """
+    digits = ''
+    while pk:
+        pk, digit = divmod(pk, 36)
+        digits = '0123456789abcdefghijklmnopqrstuvwxyz'[digit] + digits
+    return digits.rjust(Comment.PATH_STEP, '0')
+
+
 class Comment(models.Model):
     """
     Model for a comment on a post.
+    Replies form threads stored as materialized paths: the path of a
+    comment is the path of its parent followed by its own ID segment,
+    so a whole subtree is one range of the (post, path) index.
     Fields:
     - author: Comment author (foreign key to the user model).
     - post: Post related to the comment (foreign key to the post model).
     - text: Comment text.
     - created: Date and time when the comment was added.
+    - parent: Comment this one replies to.
+    - path: Materialized path of the comment in its thread.
+    - depth: Nesting level, 0 for top-level comments.
     """
+    PATH_STEP = 8
+    MAX_DEPTH = 255 // PATH_STEP - 1
+    # Sorts after every path segment character.
+    PATH_END = '~'
+
     author = models.ForeignKey(
         User, on_delete=models.CASCADE, related_name='comments')
     post = models.ForeignKey(
@@ -64,6 +96,96 @@ class Comment(models.Model):
     text = models.TextField()
     created = models.DateTimeField(
         'Date added', auto_now_add=True, db_index=True)
+    parent = models.ForeignKey(
+        'self', on_delete=models.CASCADE, related_name='replies',
+        blank=True, null=True
+    )
+    path = models.CharField(max_length=255, editable=False, default='')
+    depth = models.PositiveSmallIntegerField(editable=False, default=0)
+
+    class Meta:
+        indexes = (
+            models.Index(fields=('post', 'path'), name='comment_thread_idx'),
+            models.Index(fields=('post', 'created'),
+                         name='comment_post_created_idx'),
+        )
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        if not self.path:
+            self.store_path()
+
+    def store_path(self):
+        """
+        Derives the path from the saved ID and the parent's path.
+        """
+        if self.parent:
+            self.depth = self.parent.depth + 1
+            self.path = self.parent.path + path_segment(self.pk)
+        else:
+            self.depth = 0
+            self.path = path_segment(self.pk)
+        Comment.objects.filter(pk=self.pk).update(
+            path=self.path, depth=self.depth)
+
+    @classmethod
+    def fill_missing_paths(cls, ids):
+        """
+        Sets paths of the given comments created without save(),
+        e.g. by bulk_create, parents first.
+        """
+        while True:
+            pending = cls.objects.filter(id__in=ids, path='').exclude(
+                parent__path='').select_related('parent').order_by('id')
+            updated = False
+            for comment in pending.iterator():
+                comment.store_path()
+                updated = True
+            if not updated:
+                return
+
+    @classmethod
+    def latest_for_posts(cls, post_ids, limit):
+        """
+        Returns up to `limit` newest comments of each post, grouped by
+        post ID, in one query ranking comments with a window function.
+        The author's username is fetched as `author_username`.
+        """
+        comments = {post_id: [] for post_id in post_ids}
+        if not comments:
+            return comments
+        ranked = cls.objects.filter(post_id__in=post_ids).annotate(
+            author_username=F('author__username'),
+            comment_rank=Window(
+                RowNumber(),
+                partition_by=F('post_id'),
+                order_by=(F('created').desc(), F('id').desc())
+            )
+        )
+        sql, params = ranked.query.sql_with_params()
+        for comment in cls.objects.raw(
+                f'SELECT * FROM ({sql}) ranked WHERE comment_rank <= %s '
+                'ORDER BY post_id, comment_rank', (*params, limit)):
+            comments[comment.post_id].append(comment)
+        return comments
+
+    def subtree(self, max_depth=None, queryset=None):
+        """
+        Returns the comment and its replies in thread order,
+        optionally limited to max_depth levels below it.
+        Filters queryset (all comments by default), so that its
+        select_related and the like are kept.
+        """
+        if queryset is None:
+            queryset = Comment.objects.all()
+        comments = queryset.filter(
+            post_id=self.post_id,
+            path__gte=self.path,
+            path__lt=self.path + self.PATH_END
+        )
+        if max_depth is not None:
+            comments = comments.filter(depth__lte=self.depth + max_depth)
+        return comments.order_by('path')
 
 
 class Follow(models.Model):
@@ -81,6 +203,308 @@ class Follow(models.Model):
     class Meta:
         # Unique combination of fields
         unique_together = ('user', 'following')
+        constraints = (
+            models.CheckConstraint(
+                check=~Q(user=F('following')), name='follow_not_self'),
+        )
 
     def __str__(self):
         return f'{self.user} follows {self.following}'[:50]
+
+    @classmethod
+    def follow(cls, user_id, username):
+        """
+        Subscribes the user to the author with the given username
+        in one INSERT ... SELECT that skips an existing subscription.
+        Returns whether a subscription was created.
+        """
+        quote = connection.ops.quote_name
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'INSERT INTO {quote(cls._meta.db_table)} '
+                '(user_id, following_id) '
+                f'SELECT %s, id FROM {quote(User._meta.db_table)} '
+                'WHERE username = %s AND id <> %s '
+                'ON CONFLICT (user_id, following_id) DO NOTHING',
+                (user_id, username, user_id)
+            )
+            return cursor.rowcount == 1
+
+    @classmethod
+    def unfollow(cls, user_id, username):
+        """
+        Unsubscribes the user from the author with the given username
+        in one DELETE. Returns whether a subscription was removed.
+        """
+        quote = connection.ops.quote_name
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {quote(cls._meta.db_table)} '
+                'WHERE user_id = %s AND following_id IN ('
+                f'SELECT id FROM {quote(User._meta.db_table)} '
+                'WHERE username = %s)',
+                (user_id, username)
+            )
+            return cursor.rowcount > 0
+
+
+class Change(models.Model):
+    """
+    Model for an entry of the change log used for incremental sync.
+    The monotonically increasing id serves as the sync token.
+    Fields:
+    - kind: Kind of the changed object (post or comment).
+    - object_id: ID of the changed object.
+    - action: What happened to the object (created, updated or deleted).
+    """
+    POST = 'post'
+    COMMENT = 'comment'
+    KIND_CHOICES = ((POST, 'Post'), (COMMENT, 'Comment'))
+    CREATED = 'created'
+    UPDATED = 'updated'
+    DELETED = 'deleted'
+    ACTION_CHOICES = (
+        (CREATED, 'Created'), (UPDATED, 'Updated'), (DELETED, 'Deleted'))
+
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    object_id = models.BigIntegerField()
+    action = models.CharField(max_length=10, choices=ACTION_CHOICES)
+
+    class Meta:
+        ordering = ('id',)
+
+    def __str__(self):
+        return f'{self.kind} {self.object_id} {self.action}'
+
+
+class GroupStats(models.Model):
+    """
+    Model for statistics of a group, kept up to date on post changes.
+    Fields:
+    - group: The group (primary key).
+    - post_count: Number of posts in the group.
+    - last_post_at: Publication date of the newest post in the group.
+    """
+    group = models.OneToOneField(
+        Group, on_delete=models.CASCADE, primary_key=True,
+        related_name='stats')
+    post_count = models.IntegerField(default=0)
+    last_post_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f'{self.group}: {self.post_count} posts'[:50]
+
+
+class GroupAuthorStats(models.Model):
+    """
+    Model for the number of posts of an author in a group.
+    Fields:
+    - group: The group.
+    - author: The author.
+    - post_count: Number of posts of the author in the group.
+    """
+    group = models.ForeignKey(
+        Group, on_delete=models.CASCADE, related_name='author_stats')
+    author = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name='group_stats')
+    post_count = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ('group', 'author')
+        indexes = (
+            models.Index(fields=('group', '-post_count'),
+                         name='group_top_authors_idx'),
+        )
+
+    def __str__(self):
+        return f'{self.author} in {self.group}: {self.post_count}'[:50]
+
+
+class TrendingPost(models.Model):
+    """
+    Model for a post in the precomputed trending ranking.
+    Fields:
+    - post: The post (primary key).
+    - score: Time-decayed number of recent comments on the post.
+    - rank: Position in the ranking, starting with 1.
+    """
+    post = models.OneToOneField(
+        Post, on_delete=models.CASCADE, primary_key=True,
+        related_name='trending')
+    score = models.FloatField()
+    rank = models.PositiveIntegerField(db_index=True)
+
+    class Meta:
+        ordering = ('rank',)
+
+    def __str__(self):
+        return f'{self.rank}. {self.post}'[:50]
+
+
+class Tag(models.Model):
+    """
+    Model for a hashtag used in post texts.
+    Fields:
+    - name: The tag without `#`, in lower case.
+    - post_count: Number of posts with the tag, kept up to date
+      on post changes.
+    """
+    name = models.CharField(max_length=50, unique=True)
+    post_count = models.IntegerField(default=0)
+
+    class Meta:
+        indexes = (
+            models.Index(fields=('-post_count',), name='tag_top_idx'),
+        )
+
+    def __str__(self):
+        return f'#{self.name}'
+
+
+class PostTag(models.Model):
+    """
+    Model for a hashtag of a post.
+    Fields:
+    - tag: The tag.
+    - post: The post.
+    - pub_date: Publication date of the post, copied here so that
+      a tag's timeline is read from one index.
+    """
+    tag = models.ForeignKey(
+        Tag, on_delete=models.CASCADE, related_name='post_tags')
+    post = models.ForeignKey(
+        Post, on_delete=models.CASCADE, related_name='post_tags')
+    pub_date = models.DateTimeField()
+
+    class Meta:
+        unique_together = ('post', 'tag')
+        indexes = (
+            models.Index(fields=('tag', '-pub_date'),
+                         name='post_tag_timeline_idx'),
+        )
+
+    def __str__(self):
+        return f'{self.tag} on {self.post}'[:50]
+
+
+class Notification(models.Model):
+    """
+    Model for a notification about a mention of the user.
+    Fields:
+    - recipient: The mentioned user.
+    - actor: Author of the post or comment with the mention.
+    - post: The post with the mention, or commented on.
+    - comment: The comment with the mention, if it is in a comment.
+    - created: Date and time of the notification.
+    - is_read: Whether the recipient has read the notification.
+    """
+    recipient = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name='notifications')
+    actor = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name='+')
+    post = models.ForeignKey(
+        Post, on_delete=models.CASCADE, related_name='+')
+    comment = models.ForeignKey(
+        Comment, on_delete=models.CASCADE, related_name='+',
+        null=True, blank=True)
+    created = models.DateTimeField(auto_now_add=True)
+    is_read = models.BooleanField(default=False)
+
+    class Meta:
+        indexes = (
+            models.Index(fields=('recipient', '-created'),
+                         name='notification_inbox_idx'),
+        )
+
+    def __str__(self):
+        return f'{self.actor} mentioned {self.recipient}'[:50]
+
+
+class UnreadCount(models.Model):
+    """
+    Model for the number of unread notifications of a user,
+    kept up to date as notifications are added, read or deleted.
+    Fields:
+    - user: The user (primary key).
+    - count: Number of unread notifications.
+    """
+    user = models.OneToOneField(
+        User, on_delete=models.CASCADE, primary_key=True,
+        related_name='unread_count')
+    count = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f'{self.user}: {self.count} unread'[:50]
+
+
+class Like(models.Model):
+    """
+    Model for a like of a post.
+    Fields:
+    - user: The user who likes the post.
+    - post: The liked post.
+    - created: Date and time of the like.
+    """
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name='likes')
+    post = models.ForeignKey(
+        Post, on_delete=models.CASCADE, related_name='likes')
+    created = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ('user', 'post')
+
+    def __str__(self):
+        return f'{self.user} likes {self.post}'[:50]
+
+
+class LikeCounterShard(models.Model):
+    """
+    Model for a shard of the change of a post's number of likes
+    not yet folded into Post.like_count. Concurrent likes of a post
+    update different shards instead of contending for one row.
+    Fields:
+    - post: The post.
+    - shard: Number of the shard.
+    - delta: Change of the number of likes.
+    """
+    post = models.ForeignKey(
+        Post, on_delete=models.CASCADE, related_name='like_shards')
+    shard = models.PositiveSmallIntegerField()
+    delta = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ('post', 'shard')
+
+    def __str__(self):
+        return f'{self.post} #{self.shard}: {self.delta:+}'[:50]
+
+
+class FollowSuggestion(models.Model):
+    """
+    Model for an author suggested to a user to follow,
+    precomputed from the follow graph.
+    Fields:
+    - user: The user the author is suggested to.
+    - suggested: The suggested author.
+    - mutual_count: Number of authors followed by the user
+      who follow the suggested author.
+    - rank: Position among the user's suggestions, starting with 1.
+    - generation: Run of the computation that stored the suggestion;
+      a user's oldest generation is the current one until the run
+      writing the next one removes it.
+    """
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name='follow_suggestions')
+    suggested = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name='+')
+    mutual_count = models.PositiveIntegerField()
+    rank = models.PositiveIntegerField()
+    generation = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ('user', 'generation', 'rank')
+        unique_together = ('user', 'generation', 'rank')
+
+    def __str__(self):
+        return f'{self.suggested} for {self.user}'[:50]
@@ -0,0 +1,148 @@
+import logging
+import queue
+import re
+import threading
+from collections import Counter
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import F
+
+from .models import Comment, Notification, UnreadCount, User
+
+logger = logging.getLogger(__name__)
+
+MENTION_RE = re.compile(r'(?<![\w@])@([\w.+-]+)')
+MAX_MENTIONS = 50
+MENTION_QUEUE_SIZE = 1000
+
+
+def extract_mentions(text):
+    """
+    Returns the usernames mentioned in the text, at most MAX_MENTIONS.
+    """
+    names = []
+    for name in MENTION_RE.findall(text):
+        # A mention at the end of a sentence is followed by a dot.
+        name = name.rstrip('.')
+        if name and name not in names:
+            names.append(name)
+    return names[:MAX_MENTIONS]
+
+
+def update_unread_counts(deltas):
+    """
+    Applies changes of the numbers of unread notifications,
+    deltas mapping user_id to the change.
+    """
+    for user_id, delta in deltas.items():
+        if not delta:
+            continue
+        # Rows are only created for additions, like in group statistics.
+        if delta < 0 or not UnreadCount.objects.get_or_create(
+                user_id=user_id, defaults={'count': delta})[1]:
+            UnreadCount.objects.filter(user_id=user_id).update(
+                count=F('count') + delta)
+
+
+def notify_mentions(model, pk):
+    """
+    Creates notifications for the users mentioned in a post
+    or comment and counts them as unread.
+    """
+    obj = model.objects.filter(pk=pk).first()
+    if obj is None:
+        return 0
+    recipient_ids = list(User.objects.filter(
+        username__in=extract_mentions(obj.text)
+    ).exclude(id=obj.author_id).values_list('id', flat=True))
+    with transaction.atomic():
+        Notification.objects.bulk_create(
+            Notification(
+                recipient_id=recipient_id, actor_id=obj.author_id,
+                post_id=obj.post_id if model is Comment else obj.id,
+                comment_id=obj.id if model is Comment else None,
+            )
+            for recipient_id in recipient_ids
+        )
+        update_unread_counts(Counter(recipient_ids))
+    return len(recipient_ids)
+
+
+def _notify_logged(model, pk):
+    try:
+        notify_mentions(model, pk)
+    except Exception:
+        logger.exception('Notifying mentions of %s %s failed',
+                         model.__name__, pk)
+
+
+class MentionNotifier:
+    """
+    Fans out mentions in a single worker thread, one object after
+    another. Its queue is bounded: when it is full, the caller fans
+    out the mentions itself, so a burst slows writers down instead of
+    piling up memory.
+    """
+
+    def __init__(self, maxsize=MENTION_QUEUE_SIZE):
+        self._queue = queue.Queue(maxsize)
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def submit(self, model, pk):
+        try:
+            self._queue.put_nowait((model, pk))
+        except queue.Full:
+            _notify_logged(model, pk)
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name='mention-notifier', daemon=True)
+                self._thread.start()
+
+    def join(self):
+        """
+        Waits until every submitted object is fanned out.
+        """
+        self._queue.join()
+
+    def _run(self):
+        while True:
+            model, pk = self._queue.get()
+            try:
+                _notify_logged(model, pk)
+            finally:
+                close_old_connections()
+                self._queue.task_done()
+
+
+notifier = MentionNotifier()
+
+
+def schedule_mention_notifications(instance):
+    """
+    Fans out the mentions of a new post or comment once it is
+    committed, in the notifier thread unless
+    NOTIFY_MENTIONS_IN_BACKGROUND is off.
+    """
+    if '@' not in instance.text:
+        return
+    model = type(instance)
+    if settings.NOTIFY_MENTIONS_IN_BACKGROUND:
+        transaction.on_commit(lambda: notifier.submit(model, instance.pk))
+    else:
+        transaction.on_commit(lambda: notify_mentions(model, instance.pk))
+
+
+def mark_read(user):
+    """
+    Marks all notifications of the user as read.
+    Returns how many were unread.
+    """
+    with transaction.atomic():
+        marked = Notification.objects.filter(
+            recipient=user, is_read=False).update(is_read=True)
+        update_unread_counts({user.id: -marked})
+    return marked
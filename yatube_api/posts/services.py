@@ -0,0 +1,109 @@
+import logging
+import threading
+
+from django.db import connection, models, transaction
+from django.db.models.deletion import get_candidate_relations_to_delete
+
+from .signals import post_bulk_delete, pre_bulk_delete
+
+logger = logging.getLogger(__name__)
+
+BULK_DELETE_BATCH_SIZE = 500
+
+
+def _log_progress(model, deleted):
+    logger.info('Deleted %s %s rows', deleted, model._meta.label)
+
+
+def _raw_delete(model, pks):
+    """
+    Deletes rows by primary key with a single DELETE ... WHERE id IN (...).
+    """
+    quote = connection.ops.quote_name
+    placeholders = ', '.join(['%s'] * len(pks))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {quote(model._meta.db_table)} '
+            f'WHERE {quote(model._meta.pk.column)} IN ({placeholders})',
+            pks
+        )
+
+
+def _clear_dependents(model, pks, batch_size, progress):
+    """
+    Handles every relation pointing at the given rows of the model
+    before those rows are deleted.
+    """
+    for related in get_candidate_relations_to_delete(model._meta):
+        on_delete = related.field.remote_field.on_delete
+        if on_delete is models.DO_NOTHING:
+            continue
+        dependents = related.related_model._base_manager.filter(
+            **{f'{related.field.name}__in': pks})
+        if on_delete is models.CASCADE:
+            bulk_delete(dependents, batch_size, progress)
+        elif on_delete is models.SET_NULL:
+            dependents.update(**{related.field.name: None})
+        elif on_delete in (models.PROTECT, models.RESTRICT):
+            if dependents.exists():
+                raise models.ProtectedError(
+                    f'Cannot bulk delete {model._meta.label} rows '
+                    f'referenced through {related.field}.',
+                    set()
+                )
+        else:
+            # SET_DEFAULT, SET(...) and custom handlers are left
+            # to the regular deletion collector.
+            dependents.delete()
+
+
+def bulk_delete(queryset, batch_size=BULK_DELETE_BATCH_SIZE, progress=None):
+    """
+    Deletes the rows of the queryset together with their cascades
+    in bounded batches.
+    Unlike QuerySet.delete(), related objects are never loaded into
+    memory and model delete signals are not sent: dependents are removed
+    bottom-up with raw DELETE statements, each batch in its own
+    transaction. pre_bulk_delete/post_bulk_delete are sent per batch.
+    Returns the number of rows of the queryset's model deleted.
+    """
+    model = queryset.model
+    progress = progress or _log_progress
+    pk_queryset = queryset.order_by().values_list('pk', flat=True)
+    deleted = 0
+    while True:
+        pks = list(pk_queryset[:batch_size])
+        if not pks:
+            return deleted
+        _clear_dependents(model, pks, batch_size, progress)
+        with transaction.atomic():
+            pre_bulk_delete.send(sender=model, pks=pks)
+            _raw_delete(model, pks)
+            post_bulk_delete.send(sender=model, pks=pks)
+        deleted += len(pks)
+        progress(model, deleted)
+
+
+def run_in_background(function, *args, **kwargs):
+    """
+    Runs the function in a daemon thread with its own database connection.
+    """
+    def target():
+        try:
+            function(*args, **kwargs)
+        except Exception:
+            logger.exception('Background task %s failed', function.__name__)
+        finally:
+            connection.close()
+
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    return thread
+
+
+def bulk_delete_in_background(model, pks, batch_size=BULK_DELETE_BATCH_SIZE):
+    """
+    Starts bulk deletion of the given model rows in a background thread.
+    """
+    return run_in_background(
+        bulk_delete, model._base_manager.filter(pk__in=list(pks)), batch_size)
@@ -0,0 +1,200 @@
+from collections import Counter
+
+from django.db.models import Count
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import Signal, receiver
+
+from .likes import count_deleted_likes
+from .models import Change, Comment, Like, Notification, Post, PostTag
+from .notifications import (schedule_mention_notifications,
+                            update_unread_counts)
+from .stats import refresh_last_post_at, update_group_stats
+from .tags import sync_tags, update_tag_counts
+
+# Sent by posts.services.bulk_delete for every batch of rows it removes
+# with raw SQL, since regular pre_delete/post_delete signals are skipped.
+# Arguments: sender (the model class), pks (list of primary keys).
+pre_bulk_delete = Signal()
+post_bulk_delete = Signal()
+
+CHANGE_KINDS = {Post: Change.POST, Comment: Change.COMMENT}
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_save, sender=Comment)
+def log_saved(sender, instance, created, raw=False, **kwargs):
+    """
+    Records creation or editing of a post or comment in the change log.
+    """
+    if raw:
+        return
+    Change.objects.create(
+        kind=CHANGE_KINDS[sender],
+        object_id=instance.pk,
+        action=Change.CREATED if created else Change.UPDATED
+    )
+
+
+@receiver(post_delete, sender=Post)
+@receiver(post_delete, sender=Comment)
+def log_deleted(sender, instance, **kwargs):
+    """
+    Records a tombstone for a deleted post or comment.
+    """
+    Change.objects.create(
+        kind=CHANGE_KINDS[sender], object_id=instance.pk,
+        action=Change.DELETED)
+
+
+@receiver(pre_bulk_delete, sender=Post)
+@receiver(pre_bulk_delete, sender=Comment)
+def log_bulk_deleted(sender, pks, **kwargs):
+    """
+    Records tombstones for a batch of posts or comments removed
+    by bulk deletion.
+    """
+    Change.objects.bulk_create(
+        Change(kind=CHANGE_KINDS[sender], object_id=pk,
+               action=Change.DELETED)
+        for pk in pks
+    )
+
+
+@receiver(pre_save, sender=Post)
+def remember_previous(sender, instance, raw=False, **kwargs):
+    """
+    Remembers the group and text of an edited post to move it
+    in group statistics and reindex its hashtags.
+    """
+    if raw or instance._state.adding:
+        return
+    instance._previous_group_id, instance._previous_text = (
+        Post.objects.filter(pk=instance.pk).values_list(
+            'group_id', 'text').first() or (None, None))
+
+
+@receiver(post_save, sender=Post)
+def count_saved_post(sender, instance, created, raw=False, **kwargs):
+    """
+    Counts a new post, or a post moved between groups,
+    in group statistics.
+    """
+    if raw:
+        return
+    previous_group_id = None if created else getattr(
+        instance, '_previous_group_id', instance.group_id)
+    if not created and previous_group_id == instance.group_id:
+        return
+    update_group_stats(
+        {(previous_group_id, instance.author_id): -1,
+         (instance.group_id, instance.author_id): 1},
+        {instance.group_id: instance.pub_date}
+    )
+    refresh_last_post_at([previous_group_id])
+
+
+@receiver(post_delete, sender=Post)
+def count_deleted_post(sender, instance, **kwargs):
+    """
+    Removes a deleted post from group statistics.
+    """
+    update_group_stats({(instance.group_id, instance.author_id): -1})
+    refresh_last_post_at([instance.group_id])
+
+
+@receiver(pre_bulk_delete, sender=Post)
+def count_bulk_deleted_posts(sender, pks, **kwargs):
+    """
+    Removes a batch of bulk deleted posts from group statistics.
+    """
+    counts = Post.objects.filter(pk__in=pks).order_by().values_list(
+        'group_id', 'author_id').annotate(count=Count('id'))
+    deltas = Counter()
+    for group_id, author_id, count in counts:
+        deltas[group_id, author_id] -= count
+    update_group_stats(deltas)
+    refresh_last_post_at({group_id for group_id, _ in deltas}, pks)
+
+
+@receiver(post_save, sender=Post)
+def index_tags(sender, instance, created, raw=False, **kwargs):
+    """
+    Indexes the hashtags of a new or edited post.
+    """
+    if raw:
+        return
+    if created and '#' not in instance.text:
+        return
+    if not created and getattr(
+            instance, '_previous_text', None) == instance.text:
+        return
+    sync_tags([instance])
+
+
+@receiver(post_delete, sender=PostTag)
+def count_deleted_post_tag(sender, instance, **kwargs):
+    """
+    Counts a post out of a tag when it loses the tag or is deleted.
+    """
+    update_tag_counts({instance.tag_id: -1})
+
+
+@receiver(pre_bulk_delete, sender=PostTag)
+def count_bulk_deleted_post_tags(sender, pks, **kwargs):
+    """
+    Counts a batch of bulk deleted posts out of their tags.
+    """
+    deltas = Counter()
+    for tag_id in PostTag.objects.filter(pk__in=pks).values_list(
+            'tag_id', flat=True):
+        deltas[tag_id] -= 1
+    update_tag_counts(deltas)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_save, sender=Comment)
+def notify_mentioned(sender, instance, created, raw=False, **kwargs):
+    """
+    Notifies the users mentioned in a new post or comment.
+    """
+    if created and not raw:
+        schedule_mention_notifications(instance)
+
+
+@receiver(post_delete, sender=Notification)
+def count_deleted_notification(sender, instance, **kwargs):
+    """
+    Stops counting a deleted unread notification.
+    """
+    if not instance.is_read:
+        update_unread_counts({instance.recipient_id: -1})
+
+
+@receiver(pre_bulk_delete, sender=Notification)
+def count_bulk_deleted_notifications(sender, pks, **kwargs):
+    """
+    Stops counting a batch of bulk deleted unread notifications.
+    """
+    deltas = Counter()
+    for recipient_id in Notification.objects.filter(
+            pk__in=pks, is_read=False).values_list(
+                'recipient_id', flat=True):
+        deltas[recipient_id] -= 1
+    update_unread_counts(deltas)
+
+
+@receiver(post_delete, sender=Like)
+def count_deleted_like(sender, instance, **kwargs):
+    """
+    Counts out a like deleted along with its user.
+    """
+    count_deleted_likes([instance.post_id])
+
+
+@receiver(pre_bulk_delete, sender=Like)
+def count_bulk_deleted_likes(sender, pks, **kwargs):
+    """
+    Counts out a batch of bulk deleted likes.
+    """
+    count_deleted_likes(Like.objects.filter(pk__in=pks).values_list(
+        'post_id', flat=True))
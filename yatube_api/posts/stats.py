@@ -0,0 +1,77 @@
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Count, F, Max
+from django.db.models.functions import Coalesce, Greatest
+
+from .models import Group, GroupAuthorStats, GroupStats, Post
+
+
+def update_group_stats(deltas, latest=None):
+    """
+    Applies post count changes to the group statistics.
+    deltas maps (group_id, author_id) to the change of the number of
+    posts, latest maps group_id to the pub_date of the newest post added.
+    """
+    latest = latest or {}
+    group_deltas = Counter()
+    for (group_id, author_id), delta in deltas.items():
+        if group_id is None or not delta:
+            continue
+        group_deltas[group_id] += delta
+        author_stats = GroupAuthorStats.objects.filter(
+            group_id=group_id, author_id=author_id)
+        # Rows are only created for additions: a missing row on removal
+        # means the group or author is being deleted along with it.
+        if delta < 0 or not GroupAuthorStats.objects.get_or_create(
+                group_id=group_id, author_id=author_id,
+                defaults={'post_count': delta})[1]:
+            author_stats.update(post_count=F('post_count') + delta)
+    for group_id in (group_deltas.keys() | latest.keys()) - {None}:
+        if group_deltas[group_id] > 0 and GroupStats.objects.get_or_create(
+                group_id=group_id,
+                defaults={'post_count': group_deltas[group_id],
+                          'last_post_at': latest.get(group_id)})[1]:
+            continue
+        changes = {'post_count': F('post_count') + group_deltas[group_id]}
+        if latest.get(group_id) is not None:
+            changes['last_post_at'] = Greatest(
+                Coalesce('last_post_at', latest[group_id]), latest[group_id])
+        GroupStats.objects.filter(group_id=group_id).update(**changes)
+
+
+def refresh_last_post_at(group_ids, exclude_pks=()):
+    """
+    Recomputes the newest post date of the groups,
+    ignoring posts that are about to be deleted.
+    """
+    for group_id in group_ids:
+        if group_id is None:
+            continue
+        last_post_at = Post.objects.filter(group_id=group_id).exclude(
+            pk__in=exclude_pks).aggregate(last=Max('pub_date'))['last']
+        GroupStats.objects.filter(group_id=group_id).update(
+            last_post_at=last_post_at)
+
+
+def reconcile_group_stats(groups=None):
+    """
+    Rebuilds the statistics of the groups (all by default)
+    from the posts table.
+    """
+    groups = Group.objects.all() if groups is None else groups
+    for group_id in groups.values_list('id', flat=True).iterator():
+        posts = Post.objects.filter(group_id=group_id)
+        with transaction.atomic():
+            totals = posts.aggregate(count=Count('id'), last=Max('pub_date'))
+            GroupStats.objects.update_or_create(
+                group_id=group_id,
+                defaults={'post_count': totals['count'],
+                          'last_post_at': totals['last']})
+            GroupAuthorStats.objects.filter(group_id=group_id).delete()
+            GroupAuthorStats.objects.bulk_create(
+                GroupAuthorStats(group_id=group_id, author_id=author_id,
+                                 post_count=count)
+                for author_id, count in posts.order_by().values_list(
+                    'author_id').annotate(count=Count('id'))
+            )
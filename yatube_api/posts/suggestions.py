@@ -0,0 +1,92 @@
+import heapq
+from array import array
+from collections import Counter
+
+from django.db.models import Max
+
+from .models import Follow, FollowSuggestion, User
+
+SUGGESTIONS_SIZE = 20
+# Only this many followings of each followed author are looked at,
+# so that following a prolific follower stays cheap.
+SUGGESTIONS_MAX_FANOUT = 1000
+GRAPH_CHUNK_SIZE = 5000
+SAVE_BATCH_SIZE = 1000
+
+
+def load_follow_graph():
+    """
+    Loads the follow graph into integer arrays: user_ids holds the IDs
+    of all users in order, and the users followed by the user with
+    index i are targets[offsets[i]:offsets[i + 1]], as indexes.
+    """
+    user_ids = array('q', User.objects.order_by('id').values_list(
+        'id', flat=True).iterator(chunk_size=GRAPH_CHUNK_SIZE))
+    index = {user_id: i for i, user_id in enumerate(user_ids)}
+    offsets = array('q', [0]) * (len(user_ids) + 1)
+    targets = array('q')
+    follows = Follow.objects.order_by('user_id', 'following_id').values_list(
+        'user_id', 'following_id')
+    for user_id, following_id in follows.iterator(
+            chunk_size=GRAPH_CHUNK_SIZE):
+        offsets[index[user_id] + 1] += 1
+        targets.append(index[following_id])
+    for i in range(len(user_ids)):
+        offsets[i + 1] += offsets[i]
+    return user_ids, offsets, targets
+
+
+def compute_suggestions(graph, size=SUGGESTIONS_SIZE,
+                        max_fanout=SUGGESTIONS_MAX_FANOUT):
+    """
+    Yields (user_id, [(suggested_id, mutual_count), ...]) with the top
+    `size` authors followed by the authors each user follows, ranked by
+    how many of them do, leaving out authors the user already follows.
+    """
+    user_ids, offsets, targets = graph
+    for user in range(len(user_ids)):
+        followed = targets[offsets[user]:offsets[user + 1]]
+        if not followed:
+            continue
+        mutual = Counter()
+        for author in followed:
+            start = offsets[author]
+            mutual.update(targets[start:min(
+                offsets[author + 1], start + max_fanout)])
+        for excluded in (user, *followed):
+            mutual.pop(excluded, None)
+        top = heapq.nsmallest(
+            size, mutual.items(), key=lambda item: (-item[1], item[0]))
+        if top:
+            yield user_ids[user], [
+                (user_ids[suggested], count) for suggested, count in top]
+
+
+def refresh_suggestions(**kwargs):
+    """
+    Replaces the stored suggestions with freshly computed ones.
+    Accepts the arguments of compute_suggestions.
+    Returns the number of users with suggestions.
+    The new generation is written in batches of short transactions
+    while the previous one keeps being served, then the previous one
+    is deleted, so the database is never locked for the whole run.
+    """
+    graph = load_follow_graph()
+    generation = (FollowSuggestion.objects.aggregate(
+        last=Max('generation'))['last'] or 0) + 1
+    users = 0
+    batch = []
+    for user_id, top in compute_suggestions(graph, **kwargs):
+        users += 1
+        batch.extend(
+            FollowSuggestion(user_id=user_id, suggested_id=suggested_id,
+                             mutual_count=count, rank=rank,
+                             generation=generation)
+            for rank, (suggested_id, count) in enumerate(top, start=1)
+        )
+        if len(batch) >= SAVE_BATCH_SIZE:
+            FollowSuggestion.objects.bulk_create(batch)
+            batch = []
+    FollowSuggestion.objects.bulk_create(batch)
+    FollowSuggestion.objects.exclude(generation=generation).delete()
+    return users
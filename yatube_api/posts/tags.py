@@ -0,0 +1,65 @@
+import re
+from collections import Counter, defaultdict
+
+from django.db.models import F, Q
+
+from .models import PostTag, Tag
+
+HASHTAG_RE = re.compile(r'(?<![\w#])#(\w+)')
+MAX_TAG_LENGTH = Tag._meta.get_field('name').max_length
+
+
+def extract_tags(text):
+    """
+    Returns the normalized names of the hashtags in the text.
+    """
+    return {
+        name.lower() for name in HASHTAG_RE.findall(text)
+        if len(name) <= MAX_TAG_LENGTH
+    }
+
+
+def update_tag_counts(deltas):
+    """
+    Applies changes of the numbers of posts to the tags,
+    deltas mapping tag_id to the change.
+    """
+    by_delta = defaultdict(list)
+    for tag_id, delta in deltas.items():
+        if delta:
+            by_delta[delta].append(tag_id)
+    for delta, tag_ids in by_delta.items():
+        Tag.objects.filter(id__in=tag_ids).update(
+            post_count=F('post_count') + delta)
+
+
+def sync_tags(posts):
+    """
+    Makes the indexed hashtags of the posts match their texts.
+    Removed tags are counted down by the PostTag delete receivers.
+    """
+    wanted = {post.id: extract_tags(post.text) for post in posts}
+    names = set().union(*wanted.values())
+    Tag.objects.bulk_create(
+        (Tag(name=name) for name in names), ignore_conflicts=True)
+    tag_ids = dict(Tag.objects.filter(
+        name__in=names).values_list('name', 'id'))
+    current = defaultdict(set)
+    for post_id, tag_id in PostTag.objects.filter(
+            post_id__in=wanted).values_list('post_id', 'tag_id'):
+        current[post_id].add(tag_id)
+    added = []
+    removed = Q()
+    for post in posts:
+        ids = {tag_ids[name] for name in wanted[post.id]}
+        added.extend(
+            PostTag(post_id=post.id, tag_id=tag_id, pub_date=post.pub_date)
+            for tag_id in ids - current[post.id]
+        )
+        if current[post.id] - ids:
+            removed |= Q(post_id=post.id,
+                         tag_id__in=current[post.id] - ids)
+    PostTag.objects.bulk_create(added)
+    update_tag_counts(Counter(post_tag.tag_id for post_tag in added))
+    if removed:
+        PostTag.objects.filter(removed).delete()
@@ -0,0 +1,48 @@
+import heapq
+import math
+from collections import defaultdict
+from datetime import timedelta
+from operator import itemgetter
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Comment, TrendingPost
+
+TRENDING_WINDOW = timedelta(hours=48)
+TRENDING_HALF_LIFE = timedelta(hours=6)
+TRENDING_SIZE = 100
+TRENDING_CHUNK_SIZE = 5000
+
+
+def compute_trending(now=None, window=TRENDING_WINDOW,
+                     half_life=TRENDING_HALF_LIFE, size=TRENDING_SIZE):
+    """
+    Scores posts by their comments created within the window, each
+    comment weighing half as much every half_life, and returns the
+    top `size` (post_id, score) pairs.
+    """
+    now = now or timezone.now()
+    decay = math.log(2) / half_life.total_seconds()
+    scores = defaultdict(float)
+    recent = Comment.objects.filter(
+        created__gte=now - window).values_list('post_id', 'created')
+    for post_id, created in recent.iterator(chunk_size=TRENDING_CHUNK_SIZE):
+        scores[post_id] += math.exp(
+            -decay * max((now - created).total_seconds(), 0))
+    return heapq.nlargest(size, scores.items(), key=itemgetter(1))
+
+
+def refresh_trending(**kwargs):
+    """
+    Replaces the stored ranking with a freshly computed one.
+    Accepts the arguments of compute_trending.
+    """
+    top = compute_trending(**kwargs)
+    with transaction.atomic():
+        TrendingPost.objects.all().delete()
+        TrendingPost.objects.bulk_create(
+            TrendingPost(post_id=post_id, score=score, rank=rank)
+            for rank, (post_id, score) in enumerate(top, start=1)
+        )
+    return len(top)
@@ -9,8 +9,18 @@ https://docs.djangoproject.com/en/3.2/howto/deployment/asgi/
 
 import os
 
-from django.core.asgi import get_asgi_application
+import django
+
+from yatube_api.handlers import StreamingASGIHandler
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yatube_api.settings')
 
-application = get_asgi_application()
+# What get_asgi_application() does, with a handler that can stream
+# responses produced by database queries.
+django.setup(set_prefix=False)
+django_application = StreamingASGIHandler()
+
+# Imported once Django is set up.
+from api.sse import PostStreamRouter  # noqa: E402
+
+application = PostStreamRouter(django_application)
@@ -0,0 +1,45 @@
+from asgiref.sync import ThreadSensitiveContext, sync_to_async
+from django.core.handlers.asgi import ASGIHandler
+from django.db import close_old_connections
+
+
+class StreamingASGIHandler(ASGIHandler):
+    """
+    ASGI handler reading streaming responses off the event loop.
+    Django 3.2 iterates them in the loop itself, where the queries of
+    a lazily produced body are not allowed. Here every part is pulled
+    through sync_to_async, all in one thread per response, so that a
+    server-side cursor stays with the connection that opened it.
+    """
+
+    async def send_response(self, response, send):
+        if not response.streaming:
+            return await super().send_response(response, send)
+        headers = [
+            (header.encode('ascii') if isinstance(header, str) else header,
+             value.encode('latin1') if isinstance(value, str) else value)
+            for header, value in response.items()
+        ]
+        headers.extend(
+            (b'Set-Cookie', cookie.output(header='').encode('ascii').strip())
+            for cookie in response.cookies.values()
+        )
+        await send({'type': 'http.response.start',
+                    'status': response.status_code, 'headers': headers})
+        async with ThreadSensitiveContext():
+            pull = sync_to_async(next, thread_sensitive=True)
+            parts = iter(response)
+            try:
+                while True:
+                    # Parts are bytes, so None can only mean the end.
+                    part = await pull(parts, None)
+                    if part is None:
+                        break
+                    for chunk, _ in self.chunk_bytes(part):
+                        await send({'type': 'http.response.body',
+                                    'body': chunk, 'more_body': True})
+            finally:
+                await sync_to_async(
+                    close_old_connections, thread_sensitive=True)()
+        await send({'type': 'http.response.body'})
+        await sync_to_async(response.close, thread_sensitive=True)()
@@ -63,6 +63,36 @@ DATABASES = {
     }
 }
 
+# Shared by all worker processes on the host.
+CACHES = {
+    'default': {
+        'BACKEND': 'yatube_api.sqlite_cache.SQLiteCache',
+        'LOCATION': BASE_DIR / 'cache.sqlite3',
+        'OPTIONS': {
+            'MAX_ENTRIES': 10000,
+        },
+    },
+    # IDs of missing posts (api.cache) are kept apart, so that requests
+    # for random IDs cannot evict the entries of the default cache.
+    'missing_posts': {
+        'BACKEND': 'yatube_api.sqlite_cache.SQLiteCache',
+        'LOCATION': BASE_DIR / 'cache-missing.sqlite3',
+        'OPTIONS': {
+            'MAX_ENTRIES': 1000,
+        },
+    },
+    # Responses replayed for Idempotency-Key (api.mixins) must outlive
+    # any LRU pressure: entries here only leave once they expire.
+    'idempotency': {
+        'BACKEND': 'yatube_api.sqlite_cache.SQLiteCache',
+        'LOCATION': BASE_DIR / 'cache-idempotency.sqlite3',
+        'OPTIONS': {
+            'MAX_ENTRIES': 10000,
+            'EVICT': False,
+        },
+    },
+}
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -101,8 +131,26 @@ REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
         'rest_framework_simplejwt.authentication.JWTAuthentication',
     ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'rest_framework.renderers.JSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+        'api.renderers.StreamingJSONRenderer',
+        'api.renderers.ColumnarJSONRenderer',
+    ],
 }
 
+# Delivers new posts to the /api/v1/stream/posts/ subscribers.
+# Replace with a cross-worker backend when running several workers.
+POST_BROADCAST_BACKEND = 'api.broadcast.LocalBroadcast'
+
+# Commits comment and follow inserts of concurrent requests in batches
+# from one writer thread (posts.group_commit).
+GROUP_COMMIT_WRITES = False
+
+# Creates mention notifications in a background thread after the post
+# or comment is committed, instead of in the request.
+NOTIFY_MENTIONS_IN_BACKGROUND = True
+
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 SIMPLE_JWT = {
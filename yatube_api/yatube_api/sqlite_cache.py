@@ -0,0 +1,191 @@
+import itertools
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+# Reads refresh the LRU timestamp at most this often (seconds),
+# so that hot keys do not turn every read into a write.
+LRU_RESOLUTION = 1
+BUSY_TIMEOUT = 5
+# Writes between two checks of the number of entries, since counting
+# them scans the table.
+CULL_EVERY = 100
+
+
+class SQLiteCache(BaseCache):
+    """
+    Cache backend keeping entries in a local SQLite file, so that all
+    worker processes of a host share one cache.
+    Supports per-key timeouts, atomic increments (integers are stored
+    natively and incremented in SQL) and LRU eviction once MAX_ENTRIES
+    is exceeded, checked every CULL_EVERY writes of a process.
+    With EVICT off only expired entries are culled, so that a live
+    entry is never dropped before its timeout.
+    Versioned invalidation works through the standard `version`
+    argument and incr_version().
+    """
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        self._path = str(location)
+        self._local = threading.local()
+        options = params.get('OPTIONS', {})
+        self._cull_every = options.get('CULL_EVERY', CULL_EVERY)
+        self._evict = options.get('EVICT', True)
+        self._writes = itertools.count(1)
+
+    def _connection(self):
+        connection = getattr(self._local, 'connection', None)
+        # A connection must not be shared with a forked child process.
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(
+                self._path, timeout=BUSY_TIMEOUT, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS cache_entries ('
+                'key TEXT PRIMARY KEY, value BLOB NOT NULL, '
+                'expires REAL, accessed REAL NOT NULL)'
+            )
+            connection.execute(
+                'CREATE INDEX IF NOT EXISTS cache_entries_accessed '
+                'ON cache_entries (accessed)'
+            )
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    @contextmanager
+    def _transaction(self):
+        connection = self._connection()
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            yield connection
+        except BaseException:
+            connection.execute('ROLLBACK')
+            raise
+        connection.execute('COMMIT')
+
+    def _key(self, key, version):
+        key = self.make_key(key, version=version)
+        self.validate_key(key)
+        return key
+
+    @staticmethod
+    def _dump(value):
+        # Plain integers stay integers in SQLite so that incr() is atomic.
+        return value if type(value) is int else pickle.dumps(
+            value, pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def _load(value):
+        return value if isinstance(value, int) else pickle.loads(value)
+
+    def _cull(self, connection, now):
+        if next(self._writes) % self._cull_every:
+            return
+        count = connection.execute(
+            'SELECT COUNT(*) FROM cache_entries').fetchone()[0]
+        if count <= self._max_entries:
+            return
+        connection.execute(
+            'DELETE FROM cache_entries WHERE expires <= ?', (now,))
+        if not self._evict:
+            return
+        count = connection.execute(
+            'SELECT COUNT(*) FROM cache_entries').fetchone()[0]
+        if count > self._max_entries:
+            connection.execute(
+                'DELETE FROM cache_entries WHERE key IN ('
+                'SELECT key FROM cache_entries ORDER BY accessed LIMIT ?)',
+                (max(count // self._cull_frequency, 1),)
+            )
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self._key(key, version)
+        now = time.time()
+        with self._transaction() as connection:
+            connection.execute(
+                'DELETE FROM cache_entries WHERE key = ? AND expires <= ?',
+                (key, now))
+            added = connection.execute(
+                'INSERT OR IGNORE INTO cache_entries VALUES (?, ?, ?, ?)',
+                (key, self._dump(value), self.get_backend_timeout(timeout),
+                 now)
+            ).rowcount == 1
+            if added:
+                self._cull(connection, now)
+        return added
+
+    def get(self, key, default=None, version=None):
+        key = self._key(key, version)
+        connection = self._connection()
+        now = time.time()
+        row = connection.execute(
+            'SELECT value, expires, accessed FROM cache_entries '
+            'WHERE key = ?', (key,)
+        ).fetchone()
+        if row is None or (row[1] is not None and row[1] <= now):
+            return default
+        if now - row[2] > LRU_RESOLUTION:
+            connection.execute(
+                'UPDATE cache_entries SET accessed = ? WHERE key = ?',
+                (now, key))
+        return self._load(row[0])
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self._key(key, version)
+        now = time.time()
+        with self._transaction() as connection:
+            connection.execute(
+                'INSERT OR REPLACE INTO cache_entries VALUES (?, ?, ?, ?)',
+                (key, self._dump(value), self.get_backend_timeout(timeout),
+                 now)
+            )
+            self._cull(connection, now)
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self._key(key, version)
+        return self._connection().execute(
+            'UPDATE cache_entries SET expires = ? '
+            'WHERE key = ? AND (expires IS NULL OR expires > ?)',
+            (self.get_backend_timeout(timeout), key, time.time())
+        ).rowcount == 1
+
+    def delete(self, key, version=None):
+        key = self._key(key, version)
+        return self._connection().execute(
+            'DELETE FROM cache_entries WHERE key = ?', (key,)
+        ).rowcount == 1
+
+    def has_key(self, key, version=None):
+        key = self._key(key, version)
+        return self._connection().execute(
+            'SELECT 1 FROM cache_entries '
+            'WHERE key = ? AND (expires IS NULL OR expires > ?)',
+            (key, time.time())
+        ).fetchone() is not None
+
+    def incr(self, key, delta=1, version=None):
+        key = self._key(key, version)
+        now = time.time()
+        with self._transaction() as connection:
+            updated = connection.execute(
+                'UPDATE cache_entries SET value = value + ? '
+                "WHERE key = ? AND typeof(value) = 'integer' "
+                'AND (expires IS NULL OR expires > ?)',
+                (delta, key, now)
+            ).rowcount
+            if not updated:
+                raise ValueError(f"Key '{key}' not found or not an integer")
+            return connection.execute(
+                'SELECT value FROM cache_entries WHERE key = ?', (key,)
+            ).fetchone()[0]
+
+    def clear(self):
+        self._connection().execute('DELETE FROM cache_entries')